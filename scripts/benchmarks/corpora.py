@@ -0,0 +1,222 @@
+"""
+벤치마크용 합성 입력 생성기 (오프라인, 시드 고정으로 재현 가능)
+
+- Dart lib/ 트리: migrate_fontsize 가 건드리는 fontSize 패턴과
+  fix_const_* 가 고치는 const + TypographyUnified 패턴
+- 5x5 스프라이트 시트 + process_fortune_icons.MAPPING 이름의 원본 아이콘
+- 유명인 INSERT SQL 덤프 (중복 id / 잘못된 category 행 포함)
+"""
+
+import os
+import random
+
+SCALES = {
+    # name: (dart 파일 수, 시트 셀 크기 px, 원본 아이콘 크기 px, SQL 행 수)
+    'small': (50, 160, 256, 500),
+    'medium': (400, 320, 512, 5000),
+    'large': (2000, 640, 1024, 50000),
+}
+
+SEED = 20260101
+
+FONT_SIZES = ['10', '11', '12', '13', '14', '16', '18', '20', '24', '28', '32', '36', '48', '15', '22']
+WEIGHTS = ['FontWeight.w400', 'FontWeight.w600', 'FontWeight.bold']
+TYPOGRAPHY = ['bodySmall', 'bodyMedium', 'labelMedium', 'heading3']
+
+CATEGORIES = ['politician', 'actor', 'singer', 'streamer', 'business_leader', 'entertainer', 'athlete']
+
+# supabase/migrations/20250828000002_create_accurate_celebrities_table.sql 의 테이블 정의
+# (RLS / 정책 / 함수 제외)
+CELEBRITIES_DDL = """
+DROP TABLE IF EXISTS public.celebrities CASCADE;
+CREATE TABLE public.celebrities (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_en TEXT DEFAULT '',
+    birth_date TEXT NOT NULL,
+    birth_time TEXT DEFAULT '12:00',
+    gender TEXT NOT NULL CHECK (gender IN ('male', 'female', 'mixed')),
+    birth_place TEXT DEFAULT '',
+    category TEXT NOT NULL CHECK (category IN ('politician', 'actor', 'singer', 'streamer', 'business_leader', 'entertainer', 'athlete')),
+    agency TEXT DEFAULT '',
+    year_pillar TEXT DEFAULT '',
+    month_pillar TEXT DEFAULT '',
+    day_pillar TEXT DEFAULT '',
+    hour_pillar TEXT DEFAULT '',
+    saju_string TEXT DEFAULT '',
+    wood_count INTEGER DEFAULT 0,
+    fire_count INTEGER DEFAULT 0,
+    earth_count INTEGER DEFAULT 0,
+    metal_count INTEGER DEFAULT 0,
+    water_count INTEGER DEFAULT 0,
+    full_saju_data TEXT DEFAULT '',
+    data_source TEXT DEFAULT 'accurate_manual',
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc', NOW()),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc', NOW())
+);
+"""
+
+
+def _dart_widget(rng: random.Random, index: int) -> str:
+    lines = [
+        "import 'package:flutter/material.dart';",
+        "import '../../../../shared/widgets/app_card.dart';",
+        "import '../../../../core/theme/typography_unified.dart';",
+        "",
+        f"class Widget{index} extends StatelessWidget {{",
+        f"  const Widget{index}({{super.key}});",
+        "",
+        "  @override",
+        "  Widget build(BuildContext context) {",
+        "    return Column(",
+        "      children: [",
+    ]
+    for _ in range(rng.randint(3, 12)):
+        size = rng.choice(FONT_SIZES)
+        kind = rng.randrange(6)
+        if kind == 0:
+            lines.append(f"        const Text('a', style: const TextStyle(fontSize: {size})),")
+        elif kind == 1:
+            lines.append(
+                f"        Text('b', style: TextStyle(fontSize: {size}, "
+                f"fontWeight: {rng.choice(WEIGHTS)})),"
+            )
+        elif kind == 2:
+            lines += [
+                "        const Text(",
+                "          'c',",
+                f"          style: TextStyle(fontSize: {size}, color: Colors.grey),",
+                "        ),",
+            ]
+        elif kind == 3:
+            # fix_const_errors: copyWith 는 const 가 될 수 없다
+            lines += [
+                "        const Text(",
+                "          'd',",
+                f"          style: TypographyUnified.{rng.choice(TYPOGRAPHY)}.copyWith(",
+                "            color: Colors.grey,",
+                "          ),",
+                "        ),",
+            ]
+        elif kind == 4:
+            # fix_const_typography: TypographyUnified.* 앞의 const
+            lines.append(
+                f"        Text('e', style: const TypographyUnified.{rng.choice(TYPOGRAPHY)}),"
+            )
+        else:
+            lines.append("        const SizedBox(height: 8),")
+    lines += ["      ],", "    );", "  }", "}", ""]
+    return "\n".join(lines)
+
+
+def make_dart_tree(root: str, files: int, seed: int = SEED) -> str:
+    """root/lib/features/<f>/presentation/widgets/*.dart 생성, root 반환"""
+    rng = random.Random(seed)
+    for index in range(files):
+        directory = os.path.join(
+            root, 'lib', 'features', f"feature_{index % 20}", 'presentation', 'widgets'
+        )
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"widget_{index}.dart"), 'w', encoding='utf-8') as f:
+            f.write(_dart_widget(rng, index))
+    return root
+
+
+def _draw_icon(draw, rng: random.Random, box, fill):
+    left, top, right, bottom = box
+    for _ in range(rng.randint(3, 7)):
+        x0 = rng.randint(left, right - 4)
+        y0 = rng.randint(top, bottom - 4)
+        x1 = rng.randint(x0 + 2, right)
+        y1 = rng.randint(y0 + 2, bottom)
+        if rng.random() < 0.5:
+            draw.ellipse((x0, y0, x1, y1), fill=fill)
+        else:
+            draw.rectangle((x0, y0, x1, y1), fill=fill)
+
+
+def make_sprite_sheet(path: str, cell: int, grid: int = 5, seed: int = SEED) -> str:
+    """흰 배경 위 grid x grid 아이콘 시트 (불균일 여백/거터)"""
+    from PIL import Image, ImageDraw
+
+    rng = random.Random(seed)
+    gutter = cell // 8
+    size = grid * cell + (grid + 1) * gutter
+    img = Image.new('RGB', (size, size), 'white')
+    draw = ImageDraw.Draw(img)
+
+    for row in range(grid):
+        for col in range(grid):
+            left = gutter + col * (cell + gutter) + rng.randint(0, gutter // 2)
+            top = gutter + row * (cell + gutter) + rng.randint(0, gutter // 2)
+            inset = rng.randint(cell // 10, cell // 4)
+            box = (left + inset, top + inset, left + cell - inset, top + cell - inset)
+            shade = rng.randint(0, 90)
+            _draw_icon(draw, rng, box, (shade, shade, shade))
+
+    img.save(path, 'PNG')
+    return path
+
+
+def make_raw_icons(directory: str, names, size: int, seed: int = SEED) -> str:
+    """투명 배경 원본 아이콘 (콘텐츠가 한쪽으로 치우쳐 trim 이 의미 있도록)"""
+    from PIL import Image, ImageDraw
+
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    for name in names:
+        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        offset = rng.randint(0, size // 4)
+        box = (offset, offset, offset + size // 2, offset + size * 2 // 3)
+        color = (rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255), 255)
+        _draw_icon(draw, rng, box, color)
+        img.save(os.path.join(directory, name), 'PNG')
+    return directory
+
+
+def _quote(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def make_celebrity_sql(path: str, rows: int, seed: int = SEED) -> str:
+    """
+    행당 INSERT 한 문장인 유명인 SQL 덤프
+
+    약 2% 는 같은 id 를 다시 넣는 갱신(ON CONFLICT), 약 1% 는 CHECK 제약을
+    어기는 category 로 만들어 실패 경로도 포함한다.
+    """
+    rng = random.Random(seed)
+    ids = []
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("-- synthetic celebrity dump for benchmarks\n")
+        for index in range(rows):
+            if ids and rng.random() < 0.02:
+                celeb_id = rng.choice(ids)
+            else:
+                celeb_id = f"celeb_{index:06d}"
+                ids.append(celeb_id)
+
+            category = rng.choice(CATEGORIES)
+            if rng.random() < 0.01:
+                category = 'unknown_category'
+
+            birth_date = f"{rng.randint(1940, 2008)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+            values = ", ".join([
+                _quote(celeb_id),
+                _quote(f"유명인{index}"),
+                _quote(f"Celebrity {index}"),
+                _quote(birth_date),
+                _quote(rng.choice(['male', 'female'])),
+                _quote(category),
+                _quote('서울특별시'),
+                str(rng.randint(0, 4)),
+                str(rng.randint(0, 4)),
+            ])
+            f.write(
+                "INSERT INTO public.celebrities "
+                "(id, name, name_en, birth_date, gender, category, birth_place, wood_count, fire_count) "
+                f"VALUES ({values}) "
+                "ON CONFLICT (id) DO UPDATE SET name = EXCLUDED.name, updated_at = NOW();\n"
+            )
+    return path
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+scripts/ 파이프라인 벤치마크
+
+합성 입력(corpora.py)을 만들어 각 스크립트를 별도 프로세스로 실행하고,
+instrumentation 의 --run-log 결과(wall time, 단계별 처리량, peak RSS)를 모은다.
+결과는 git commit 과 함께 results/history.jsonl 에 쌓여 커밋 간 비교에 쓰인다.
+
+Pipelines:
+    fontsize               migrate_fontsize.py on a synthetic lib/ tree
+    fix-const              fix_const_errors.py on the same tree
+    fix-const-typography   fix_const_typography.py on the same tree
+    icons-split            split_fortune_icons.py on a 5x5 sprite sheet (--size 44)
+    icons-process          process_fortune_icons.py on raw icons
+    upload                 upload_celebrity_data.py into a local Postgres
+                           (BENCH_DATABASE_URL 필요, 테이블을 DROP/CREATE 하므로
+                           반드시 버려도 되는 로컬 DB 를 지정)
+
+Usage:
+    python3 scripts/benchmarks/run_benchmarks.py [--scale small|medium|large]
+        [--only NAME ...] [--repeat N] [--compare] [--no-history]
+
+Example:
+    python3 scripts/benchmarks/run_benchmarks.py --scale medium --repeat 3 --compare
+    BENCH_DATABASE_URL=postgresql://postgres@localhost/bench \\
+        python3 scripts/benchmarks/run_benchmarks.py --only upload
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.dirname(BENCH_DIR)
+REPO_ROOT = os.path.dirname(SCRIPTS_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+HISTORY_PATH = os.path.join(RESULTS_DIR, 'history.jsonl')
+
+sys.path.insert(0, SCRIPTS_DIR)
+
+import corpora  # noqa: E402
+
+
+def has_module(name: str) -> bool:
+    try:
+        __import__(name)
+    except ImportError:
+        return False
+    return True
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+class Corpus:
+    """스케일별 합성 입력. 원본은 한 번만 만들고 실행마다 작업 복사본을 쓴다."""
+
+    def __init__(self, scale: str):
+        self.scale = scale
+        self.files, self.cell, self.raw_size, self.rows = corpora.SCALES[scale]
+        self.root = tempfile.mkdtemp(prefix=f"fortune-bench-{scale}-")
+        self._built = set()
+
+    def dart_tree(self) -> str:
+        path = os.path.join(self.root, 'dart')
+        if 'dart' not in self._built:
+            corpora.make_dart_tree(path, self.files)
+            self._built.add('dart')
+        return path
+
+    def sprite_sheet(self) -> str:
+        path = os.path.join(self.root, 'sheet.png')
+        if 'sheet' not in self._built:
+            corpora.make_sprite_sheet(path, self.cell)
+            self._built.add('sheet')
+        return path
+
+    def raw_icons(self) -> str:
+        from process_fortune_icons import MAPPING
+
+        path = os.path.join(self.root, 'raw')
+        if 'raw' not in self._built:
+            corpora.make_raw_icons(path, MAPPING, self.raw_size)
+            self._built.add('raw')
+        return path
+
+    def celebrity_sql(self) -> str:
+        path = os.path.join(self.root, 'celebrities.sql')
+        if 'sql' not in self._built:
+            corpora.make_celebrity_sql(path, self.rows)
+            self._built.add('sql')
+        return path
+
+    def workdir(self) -> str:
+        return tempfile.mkdtemp(dir=self.root)
+
+    def cleanup(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def reset_celebrities(database_url: str):
+    import psycopg2
+
+    conn = psycopg2.connect(database_url)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(corpora.CELEBRITIES_DDL)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def prepare(name: str, corpus: Corpus):
+    """(argv, env) 반환. 실행할 수 없으면 건너뛴 이유 문자열 반환."""
+    work = corpus.workdir()
+
+    if name in ('fontsize', 'fix-const', 'fix-const-typography'):
+        root = os.path.join(work, 'project')
+        shutil.copytree(corpus.dart_tree(), root)
+        script = {
+            'fontsize': 'migrate_fontsize.py',
+            'fix-const': 'fix_const_errors.py',
+            'fix-const-typography': 'fix_const_typography.py',
+        }[name]
+        return [script, '--root', root], {}
+
+    if name.startswith('icons-') and not has_module('PIL'):
+        return "Pillow 미설치"
+
+    if name == 'icons-split':
+        return [
+            'split_fortune_icons.py', corpus.sprite_sheet(),
+            '--size', '44', '--effort', 'fast', '--output-dir', os.path.join(work, 'out'),
+        ], {}
+
+    if name == 'icons-process':
+        return [
+            'process_fortune_icons.py',
+            '--raw-dir', corpus.raw_icons(), '--output-dir', os.path.join(work, 'out'),
+        ], {}
+
+    if name == 'upload':
+        database_url = os.environ.get('BENCH_DATABASE_URL', '').strip()
+        if not database_url:
+            return "BENCH_DATABASE_URL 미설정"
+        if not has_module('psycopg2'):
+            return "psycopg2 미설치"
+        reset_celebrities(database_url)
+        env = {
+            'SUPABASE_DB_URL': database_url,
+            'DATABASE_URL': '',
+            'SUPABASE_DB_FALLBACK_URLS': '',
+        }
+        return ['upload_celebrity_data.py', '--sql', corpus.celebrity_sql()], env
+
+    raise ValueError(name)
+
+
+PIPELINES = ('fontsize', 'fix-const', 'fix-const-typography', 'icons-split', 'icons-process', 'upload')
+
+
+def run_once(name: str, corpus: Corpus):
+    prepared = prepare(name, corpus)
+    if isinstance(prepared, str):
+        return prepared
+
+    argv, env = prepared
+    log_path = os.path.join(corpus.workdir(), 'run.json')
+    completed = subprocess.run(
+        [sys.executable, os.path.join(SCRIPTS_DIR, argv[0]), *argv[1:], '--run-log', log_path],
+        env={**os.environ, **env},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"{name} 실패 (exit {completed.returncode}):\n{completed.stderr}")
+
+    with open(log_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def summarize(runs):
+    """반복 실행 결과를 중앙값으로 요약"""
+    wall = [run['wall_seconds'] for run in runs]
+    rss = [run['peak_rss_mb'] for run in runs if run['peak_rss_mb'] is not None]
+    last = runs[-1]
+    return {
+        'wall_seconds': round(statistics.median(wall), 4),
+        'wall_seconds_min': round(min(wall), 4),
+        'peak_rss_mb': round(statistics.median(rss), 1) if rss else None,
+        'counters': last['counters'],
+        'rates': last['rates'],
+        'stages': {name: stage['seconds'] for name, stage in last['stages'].items()},
+        'repeat': len(runs),
+    }
+
+
+def load_previous(scale: str, commit: str):
+    if not os.path.exists(HISTORY_PATH):
+        return None
+    previous = None
+    with open(HISTORY_PATH, 'r', encoding='utf-8') as f:
+        for line in f:
+            entry = json.loads(line)
+            if entry['scale'] == scale and entry['commit'] != commit:
+                previous = entry
+    return previous
+
+
+def print_table(results: dict, previous=None):
+    print(f"\n{'pipeline':<22} {'wall s':>9} {'Δ':>7} {'peak MB':>8}  rates")
+    for name, result in results.items():
+        if 'skipped' in result:
+            print(f"{name:<22} {'-':>9} {'':>7} {'-':>8}  skipped: {result['skipped']}")
+            continue
+
+        delta = ''
+        before = (previous or {}).get('results', {}).get(name, {})
+        if before.get('wall_seconds'):
+            delta = f"{result['wall_seconds'] / before['wall_seconds'] - 1:+.0%}"
+        rates = ', '.join(f"{key}={value:g}" for key, value in result['rates'].items())
+        peak = result['peak_rss_mb'] if result['peak_rss_mb'] is not None else '-'
+        print(f"{name:<22} {result['wall_seconds']:>9.3f} {delta:>7} {peak:>8}  {rates}")
+
+    if previous:
+        print(f"\nΔ vs {previous['commit']} ({previous['timestamp']})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="scripts/ 파이프라인 벤치마크")
+    parser.add_argument('--scale', choices=tuple(corpora.SCALES), default='small')
+    parser.add_argument('--only', nargs='+', choices=PIPELINES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--compare', action='store_true', help='이전 커밋의 결과와 비교')
+    parser.add_argument('--no-history', action='store_true', help='history.jsonl 에 기록하지 않음')
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    corpus = Corpus(args.scale)
+    results = {}
+    try:
+        for name in args.only or PIPELINES:
+            print(f"⏱  {name} ({args.scale}, x{args.repeat})")
+            runs = []
+            for _ in range(args.repeat):
+                run = run_once(name, corpus)
+                if isinstance(run, str):
+                    results[name] = {'skipped': run}
+                    break
+                runs.append(run)
+            if runs:
+                results[name] = summarize(runs)
+    finally:
+        corpus.cleanup()
+
+    entry = {
+        'commit': commit,
+        'timestamp': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'scale': args.scale,
+        'python': platform.python_version(),
+        'machine': f"{platform.system()}-{platform.machine()}",
+        'results': results,
+    }
+
+    print_table(results, load_previous(args.scale, commit) if args.compare else None)
+
+    if not args.no_history:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        with open(HISTORY_PATH, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        print(f"\n📝 {HISTORY_PATH}")
+
+
+if __name__ == "__main__":
+    main()
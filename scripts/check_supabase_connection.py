@@ -1,8 +1,9 @@
+import argparse
 import socket
-import requests
 import os
 import sys
 from urllib.parse import urlparse
+from instrumentation import run_log, run_main
 
 
 def extract_project_ref():
@@ -36,6 +37,8 @@ def check_hostname(hostname):
 
 def check_supabase_api(project_ref, anon_key=None):
     """Check if Supabase project is accessible via REST API"""
+    import requests
+
     try:
         url = f"https://{project_ref}.supabase.co/rest/v1/"
         headers = {}
@@ -67,9 +70,11 @@ def test_common_hostname_formats(project_ref):
     
     working_hosts = []
     
-    for hostname in hostnames_to_try:
-        if check_hostname(hostname):
-            working_hosts.append(hostname)
+    with run_log.stage('dns'):
+        for hostname in hostnames_to_try:
+            run_log.count('hostnames')
+            if check_hostname(hostname):
+                working_hosts.append(hostname)
     
     return working_hosts
 
@@ -84,7 +89,11 @@ def get_project_info():
     print(f"📋 Extracted project reference: {project_ref}")
     return project_ref
 
-def main():
+def main(argv=None):
+    argparse.ArgumentParser(
+        description="Supabase connection diagnostics (SUPABASE_URL / SUPABASE_PROJECT_REF)"
+    ).parse_args(argv)
+
     print("🔍 Supabase Connection Diagnostics")
     print("=" * 50)
     
@@ -104,7 +113,8 @@ def main():
     
     # Test Supabase API
     print(f"\n2. Testing Supabase API accessibility...")
-    check_supabase_api(project_ref, os.environ.get('SUPABASE_ANON_KEY'))
+    with run_log.stage('api'):
+        check_supabase_api(project_ref, os.environ.get('SUPABASE_ANON_KEY'))
     
     # Provide recommendations
     print(f"\n📝 Recommendations:")
@@ -123,4 +133,4 @@ def main():
             )
 
 if __name__ == "__main__":
-    main()
+    run_main(main)
@@ -3,9 +3,13 @@
 Fix const errors in migrated files
 """
 
+import argparse
 import os
 import re
 from pathlib import Path
+from instrumentation import run_log, run_main
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 
 def fix_const_in_file(filepath):
     """Remove const from widgets using TypographyUnified.copyWith"""
@@ -42,8 +46,13 @@ def fix_const_in_file(filepath):
 
     return False
 
-def main():
-    os.chdir('/Users/jacobmac/Desktop/Dev/fortune')
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--root', default=os.environ.get('FORTUNE_ROOT', REPO_ROOT),
+                        help='lib/ 가 있는 프로젝트 루트 (기본값: FORTUNE_ROOT 또는 저장소 루트)')
+    args = parser.parse_args(argv)
+
+    os.chdir(args.root)
 
     fixed = 0
     error_files = [
@@ -53,19 +62,25 @@ def main():
         'lib/shared/widgets/typography/app_text.dart',
     ]
 
-    for filepath in error_files:
-        if os.path.exists(filepath):
-            if fix_const_in_file(filepath):
-                print(f"✅ Fixed: {filepath}")
-                fixed += 1
+    with run_log.stage('known_errors'):
+        for filepath in error_files:
+            if os.path.exists(filepath):
+                run_log.count('files')
+                if fix_const_in_file(filepath):
+                    print(f"✅ Fixed: {filepath}")
+                    fixed += 1
+                    run_log.count('fixed_files')
 
     # Also scan all modified files
-    for dart_file in Path('lib').rglob('*.dart'):
-        if str(dart_file) not in error_files:
-            if fix_const_in_file(str(dart_file)):
-                fixed += 1
+    with run_log.stage('scan'):
+        for dart_file in Path('lib').rglob('*.dart'):
+            if str(dart_file) not in error_files:
+                run_log.count('files')
+                if fix_const_in_file(str(dart_file)):
+                    fixed += 1
+                    run_log.count('fixed_files')
 
     print(f"\n📊 Fixed {fixed} files")
 
 if __name__ == '__main__':
-    main()
+    run_main(main)
@@ -3,9 +3,13 @@
 Remove 'const' before TypographyUnified
 """
 
+import argparse
 import os
 import re
 from pathlib import Path
+from instrumentation import run_log, run_main
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 
 def fix_file(filepath):
     with open(filepath, 'r', encoding='utf-8') as f:
@@ -22,18 +26,26 @@ def fix_file(filepath):
         return True
     return False
 
-def main():
-    os.chdir('/Users/jacobmac/Desktop/Dev/fortune')
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--root', default=os.environ.get('FORTUNE_ROOT', REPO_ROOT),
+                        help='lib/ 가 있는 프로젝트 루트 (기본값: FORTUNE_ROOT 또는 저장소 루트)')
+    args = parser.parse_args(argv)
+
+    os.chdir(args.root)
 
     fixed = 0
-    for dart_file in Path('lib').rglob('*.dart'):
-        if 'generated' in str(dart_file):
-            continue
-        if fix_file(str(dart_file)):
-            fixed += 1
-            print(f"✅ {dart_file}")
+    with run_log.stage('scan'):
+        for dart_file in Path('lib').rglob('*.dart'):
+            if 'generated' in str(dart_file):
+                continue
+            run_log.count('files')
+            if fix_file(str(dart_file)):
+                fixed += 1
+                run_log.count('fixed_files')
+                print(f"✅ {dart_file}")
 
     print(f"\n📊 Fixed {fixed} files")
 
 if __name__ == '__main__':
-    main()
+    run_main(main)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+fortune-tools: scripts/ 의 Python 도구 통합 진입점
+
+각 서브커맨드는 실행될 때만 해당 스크립트를 import 한다. 그래서 --help 나
+가벼운 커맨드는 psycopg2 / requests / PIL / jwt 를 로드하지 않고 바로 뜬다.
+서브커맨드 뒤의 인자는 그대로 해당 스크립트의 main() 으로 전달된다.
+
+Usage:
+    python3 scripts/fortune_tools.py <command> [args...]
+
+Commands:
+    upload [--sql PATH] [--rejects CSV]       유명인 사주 SQL 업로드 (스테이징 검증 후 병합)
+    check-connection                          Supabase 연결 진단
+    codemod fontsize|fix-const|fix-const-typography [--root DIR]
+    icons split|process|optimize|hash [...]   운세 아이콘 파이프라인
+    apple-secret [...]                        Apple Sign In client_secret
+
+공통 옵션 (커맨드 뒤 아무 위치, instrumentation.py 참고):
+    --run-log PATH              단계별 시간/카운터/처리량/peak RSS JSON 저장
+    --profile [--profile-dir D] cProfile + tracemalloc 보고서 저장
+
+경로는 하드코딩 대신 옵션이나 환경변수로 지정한다.
+    FORTUNE_ROOT                codemod 대상 프로젝트 루트 (lib/ 상위)
+    FORTUNE_ICON_RAW_DIR        icons process 원본 디렉토리
+    FORTUNE_ICON_OUTPUT_DIR     icons process 출력 디렉토리
+    CELEBRITY_SQL_PATH          upload SQL 파일
+
+Example:
+    python3 scripts/fortune_tools.py codemod fontsize --root ~/Dev/fortune-flutter
+    python3 scripts/fortune_tools.py icons split ~/Downloads/fortune_icons.png --size 44
+    python3 scripts/fortune_tools.py apple-secret --check --renew-before 30
+    python3 scripts/fortune_tools.py upload --run-log logs/upload.json --profile
+"""
+
+import importlib
+import os
+import sys
+from instrumentation import run_main
+
+# 커맨드 → 스크립트 모듈 (서브커맨드가 있으면 한 단계 더)
+COMMANDS = {
+    'upload': 'upload_celebrity_data',
+    'check-connection': 'check_supabase_connection',
+    'codemod': {
+        'fontsize': 'migrate_fontsize',
+        'fix-const': 'fix_const_errors',
+        'fix-const-typography': 'fix_const_typography',
+    },
+    'icons': {
+        'split': 'split_fortune_icons',
+        'process': 'process_fortune_icons',
+        'optimize': 'png_optimize',
+        'hash': 'icon_phash',
+    },
+    'apple-secret': 'generate_apple_secret',
+}
+
+
+def resolve(argv):
+    """argv 앞부분을 COMMANDS 에서 찾아 (모듈 이름, 남은 인자, 커맨드 경로) 반환"""
+    target = COMMANDS
+    path = []
+    while isinstance(target, dict):
+        if not argv or argv[0] not in target:
+            return None, argv, path
+        path.append(argv[0])
+        target = target[argv[0]]
+        argv = argv[1:]
+    return target, argv, path
+
+
+def usage(path):
+    if not path:
+        print(__doc__)
+        return
+
+    print(f"Usage: fortune_tools.py {' '.join(path)} <command> [args...]\n")
+    for name, module in COMMANDS[path[0]].items():
+        print(f"    {name:<24} scripts/{module}.py")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+
+    module_name, rest, path = resolve(argv)
+    if module_name is None:
+        usage(path)
+        sys.exit(0 if rest[:1] in (['-h'], ['--help']) else 2)
+
+    # 스크립트끼리 서로 import 하므로 scripts/ 를 경로에 둔다
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+
+    module = importlib.import_module(module_name)
+    return run_main(module.main, rest, command=' '.join(path))
+
+
+if __name__ == "__main__":
+    main()
@@ -21,23 +21,71 @@ Apple Sign In client_secret (JWT) 생성기.
 생성된 client_secret 은 Supabase Dashboard
 Authentication → Providers → Apple → Secret Key (for OAuth) 에 입력.
 6개월 만료. 만료 전 재생성 필요.
+
+배치 모드 (여러 service ID / 환경, 또는 다른 Apple API 용 단기 ES256 토큰):
+  python3 scripts/generate_apple_secret.py --batch specs.json > secrets.json
+
+  specs.json 은 아래 항목의 JSON 배열 ("-" 이면 stdin):
+    {
+      "name": "prod",                        # 선택, 출력 식별용
+      "team_id": "5F7CN7Y54D",               # iss
+      "service_id": "com.beyond.fortune.service",  # sub (없으면 생략)
+      "key_id": "<KEY_ID>",
+      "private_key_path": "./AuthKey_<KEY_ID>.p8",
+                                             # 또는 private_key / private_key_env
+      "audience": "https://appleid.apple.com",     # 선택
+      "ttl_seconds": 1200                    # 선택, 기본 180일
+    }
+  같은 키는 한 번만 파싱해 재사용하고, 결과는 JSON 배열로 stdout 에 출력.
+
+서명 처리량 측정 (캐시된 키 vs 매번 파싱 vs 프로세스 기동):
+  python3 scripts/generate_apple_secret.py --benchmark 500
+
+만료 관리 (cron 용):
+  생성한 client_secret 은 exp 와 함께 로컬 캐시
+  (APPLE_SECRET_CACHE, 기본 ~/.cache/fortune/apple_client_secret.json, 0600) 에 저장된다.
+
+  python3 scripts/generate_apple_secret.py --check --renew-before 30
+    → 서명하지 않고 캐시만 확인. 만료 30일 전부터 exit 1
+  python3 scripts/generate_apple_secret.py --renew-before 30
+    → 캐시가 유효하면 그대로 재사용 (암호 연산 없음), 30일 이내 만료면 재서명해 캐시 갱신
+
+  두 모드 모두 stdout 에 JSON 상태 한 줄을 출력:
+    {"status": "valid|expiring|expired|missing|renewed", "exp": ..., "days_left": ...}
+  renewed 이면 캐시의 새 secret 을 Supabase 에 반영해야 한다 (--show-cached 로 출력).
 """
+import argparse
+import json
 import os
+import subprocess
 import sys
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Optional
+from instrumentation import run_log, run_main
+
+def load_env():
+    # .env 자동 로드 (선택). import 시점이 아니라 실행 시점에만.
+    try:
+        from dotenv import load_dotenv  # type: ignore
+        load_dotenv()
+    except ImportError:
+        pass
 
-try:
-    import jwt
-except ImportError:
-    print("PyJWT 미설치: pip3 install 'pyjwt[crypto]'", file=sys.stderr)
-    sys.exit(1)
 
-# .env 자동 로드 (선택)
-try:
-    from dotenv import load_dotenv  # type: ignore
-    load_dotenv()
-except ImportError:
-    pass
+DEFAULT_CACHE_PATH = os.path.join("~", ".cache", "fortune", "apple_client_secret.json")
+DEFAULT_RENEW_BEFORE_DAYS = 30
+
+
+def import_jwt():
+    # 캐시만 확인하는 실행에서는 PyJWT/cryptography 를 로드하지 않는다.
+    try:
+        import jwt
+    except ImportError:
+        print("PyJWT 미설치: pip3 install 'pyjwt[crypto]'", file=sys.stderr)
+        sys.exit(1)
+    return jwt
 
 
 def required_env(key: str) -> str:
@@ -48,12 +96,11 @@ def required_env(key: str) -> str:
     return value
 
 
-def generate_client_secret() -> str:
-    team_id = required_env("APPLE_TEAM_ID")
-    service_id = required_env("APPLE_SERVICE_ID")
-    key_id = required_env("APPLE_KEY_ID")
-    private_key = required_env("APPLE_PRIVATE_KEY")
+APPLE_AUDIENCE = "https://appleid.apple.com"
+CLIENT_SECRET_TTL = int(timedelta(days=180).total_seconds())  # 6개월
+
 
+def normalize_pem(private_key: str) -> str:
     # PEM body 가 BEGIN/END 줄 없이 들어왔으면 wrap.
     if "BEGIN PRIVATE KEY" not in private_key:
         private_key = (
@@ -61,39 +108,329 @@ def generate_client_secret() -> str:
             f"{private_key.strip()}\n"
             "-----END PRIVATE KEY-----"
         )
+    return private_key
 
-    now = datetime.utcnow()
-    expiry = now + timedelta(days=180)  # 6개월
+
+@lru_cache(maxsize=None)
+def load_private_key(private_key: str):
+    """PEM 을 EC 키 객체로 파싱 (같은 PEM 은 프로세스 내에서 한 번만)"""
+    from cryptography.hazmat.primitives.serialization import load_pem_private_key
+
+    return load_pem_private_key(normalize_pem(private_key).encode(), password=None)
+
+
+def sign_token(
+    team_id: str,
+    key_id: str,
+    private_key,
+    service_id: Optional[str] = None,
+    audience: str = APPLE_AUDIENCE,
+    ttl_seconds: int = CLIENT_SECRET_TTL,
+    now: Optional[datetime] = None,
+) -> dict:
+    """ES256 토큰 서명. private_key 는 PEM 문자열 또는 load_private_key() 결과."""
+    jwt = import_jwt()
+    if isinstance(private_key, str):
+        private_key = load_private_key(private_key)
+    run_log.count('tokens')
+
+    now = now or datetime.utcnow()
+    expiry = now + timedelta(seconds=ttl_seconds)
 
     claims = {
         "iss": team_id,
         "iat": int(now.timestamp()),
         "exp": int(expiry.timestamp()),
-        "aud": "https://appleid.apple.com",
-        "sub": service_id,
     }
+    if audience:
+        claims["aud"] = audience
+    if service_id:
+        claims["sub"] = service_id
 
     headers = {"kid": key_id, "alg": "ES256"}
 
-    return jwt.encode(claims, private_key, algorithm="ES256", headers=headers)
+    return {
+        "token": jwt.encode(claims, private_key, algorithm="ES256", headers=headers),
+        "exp": claims["exp"],
+    }
+
+
+def generate_client_secret() -> str:
+    team_id = required_env("APPLE_TEAM_ID")
+    service_id = required_env("APPLE_SERVICE_ID")
+    key_id = required_env("APPLE_KEY_ID")
+    private_key = required_env("APPLE_PRIVATE_KEY")
+
+    signed = sign_token(team_id, key_id, private_key, service_id=service_id)
+    # 이후 --check 가 만료를 알 수 있도록 캐시에도 기록
+    cache_client_secret(team_id, service_id, key_id, signed)
+    return signed["token"]
+
+
+def cache_path() -> str:
+    return os.path.expanduser(os.environ.get("APPLE_SECRET_CACHE", DEFAULT_CACHE_PATH))
+
+
+def cache_key(team_id: str, service_id: str, key_id: str, audience: str = APPLE_AUDIENCE) -> str:
+    return f"{team_id}:{service_id}:{key_id}:{audience}"
+
+
+def load_cache(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def store_cache(path: str, cache: dict):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # secret 이 담기므로 소유자만 읽기/쓰기
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def cache_client_secret(team_id: str, service_id: str, key_id: str, signed: dict) -> dict:
+    path = cache_path()
+    cache = load_cache(path)
+    entry = cache[cache_key(team_id, service_id, key_id)] = {
+        "client_secret": signed["token"],
+        "exp": signed["exp"],
+    }
+    store_cache(path, cache)
+    return entry
+
+
+def cache_status(entry: Optional[dict], renew_before_days: int, now: Optional[datetime] = None) -> dict:
+    """캐시 항목의 만료 상태 (서명/검증 없이 저장된 exp 만 본다)"""
+    if not entry:
+        return {"status": "missing", "exp": None, "expires_at": None, "days_left": None}
+
+    now = now or datetime.utcnow()
+    seconds_left = entry["exp"] - int(now.timestamp())
+    if seconds_left <= 0:
+        status = "expired"
+    elif seconds_left <= renew_before_days * 86400:
+        status = "expiring"
+    else:
+        status = "valid"
+
+    return {
+        "status": status,
+        "exp": entry["exp"],
+        "expires_at": datetime.utcfromtimestamp(entry["exp"]).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "days_left": round(seconds_left / 86400, 1),
+    }
+
+
+def ensure_client_secret(renew_before_days: int, check_only: bool = False) -> dict:
+    """
+    캐시된 client_secret 을 재사용하고, 만료 renew_before_days 일 이내일 때만 재서명
+
+    check_only 이면 재서명하지 않고 상태만 반환한다.
+    """
+    team_id = required_env("APPLE_TEAM_ID")
+    service_id = required_env("APPLE_SERVICE_ID")
+    key_id = required_env("APPLE_KEY_ID")
+
+    path = cache_path()
+    cache = load_cache(path)
+    key = cache_key(team_id, service_id, key_id)
+    status = cache_status(cache.get(key), renew_before_days)
+    status["cache"] = path
+
+    if check_only or status["status"] == "valid":
+        return status
+
+    signed = sign_token(team_id, key_id, required_env("APPLE_PRIVATE_KEY"), service_id=service_id)
+    entry = cache_client_secret(team_id, service_id, key_id, signed)
+
+    renewed = cache_status(entry, renew_before_days)
+    renewed.update({"status": "renewed", "previous": status["status"], "cache": path})
+    return renewed
+
+
+def show_cached_secret():
+    team_id = required_env("APPLE_TEAM_ID")
+    service_id = required_env("APPLE_SERVICE_ID")
+    key_id = required_env("APPLE_KEY_ID")
+
+    entry = load_cache(cache_path()).get(cache_key(team_id, service_id, key_id))
+    if not entry:
+        print("캐시된 client_secret 없음.", file=sys.stderr)
+        sys.exit(1)
+    print(entry["client_secret"])
+
+
+def read_spec_key(spec: dict) -> str:
+    if spec.get("private_key"):
+        return spec["private_key"]
+    if spec.get("private_key_path"):
+        with open(os.path.expanduser(spec["private_key_path"]), "r", encoding="utf-8") as f:
+            return f.read()
+    if spec.get("private_key_env"):
+        return required_env(spec["private_key_env"])
+    return required_env("APPLE_PRIVATE_KEY")
+
+
+def generate_batch(specs: list) -> list:
+    """spec 목록을 한 프로세스에서 서명. 키 파일/PEM 은 각각 한 번만 읽고 파싱한다."""
+    pem_by_source = {}
+    results = []
+    now = datetime.utcnow()
+
+    for index, spec in enumerate(specs):
+        source = (
+            spec.get("private_key_path")
+            or spec.get("private_key_env")
+            or spec.get("private_key")
+            or "APPLE_PRIVATE_KEY"
+        )
+        if source not in pem_by_source:
+            pem_by_source[source] = read_spec_key(spec)
+            run_log.count('keys_loaded')
+
+        signed = sign_token(
+            spec["team_id"],
+            spec["key_id"],
+            load_private_key(pem_by_source[source]),
+            service_id=spec.get("service_id"),
+            audience=spec.get("audience", APPLE_AUDIENCE),
+            ttl_seconds=int(spec.get("ttl_seconds", CLIENT_SECRET_TTL)),
+            now=now,
+        )
+        results.append({
+            "name": spec.get("name", str(index)),
+            "team_id": spec["team_id"],
+            "service_id": spec.get("service_id"),
+            "key_id": spec["key_id"],
+            "client_secret": signed["token"],
+            "exp": signed["exp"],
+            "expires_at": datetime.utcfromtimestamp(signed["exp"]).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        })
+
+    return results
+
+
+def run_batch(path: str):
+    if path == "-":
+        specs = json.load(sys.stdin)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            specs = json.load(f)
+
+    with run_log.stage('sign'):
+        results = generate_batch(specs)
+    json.dump(results, sys.stdout, indent=2)
+    print()
+
+
+def run_benchmark(count: int):
+    """서명/초 비교: 캐시된 키 객체, 매번 PEM 파싱, 매번 새 프로세스 기동"""
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.hazmat.primitives.serialization import (
+        Encoding,
+        NoEncryption,
+        PrivateFormat,
+    )
+
+    pem = ec.generate_private_key(ec.SECP256R1()).private_bytes(
+        Encoding.PEM, PrivateFormat.PKCS8, NoEncryption()
+    ).decode()
+
+    def rate(label, fn, n):
+        start = time.perf_counter()
+        for _ in range(n):
+            fn()
+        elapsed = time.perf_counter() - start
+        print(f"{label:<28} {n / elapsed:>10.1f} tokens/sec  ({elapsed / n * 1000:.3f} ms/token)")
+
+    # 첫 서명에서 일어나는 jwt / cryptography 의 지연 import 를 측정에서 제외
+    key = load_private_key(pem)
+    sign_token("TEAM", "KEY", key, "svc")
+
+    rate("cached key object", lambda: sign_token("TEAM", "KEY", key, "svc"), count)
+    rate(
+        "parse PEM every token",
+        lambda: sign_token("TEAM", "KEY", load_private_key.__wrapped__(pem), "svc"),
+        count,
+    )
+
+    # 프로세스당 1개씩 만들던 기존 방식: 인터프리터 기동 + import + PEM 파싱 + 서명
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    code = (
+        f"import os, sys; sys.path.insert(0, {script_dir!r}); "
+        "from generate_apple_secret import sign_token; "
+        "sign_token('TEAM', 'KEY', os.environ['APPLE_BENCH_PEM'], 'svc')"
+    )
+    env = {**os.environ, "APPLE_BENCH_PEM": pem}
+    startup = max(1, min(count // 50, 10))
+    rate(
+        "new process per token",
+        lambda: subprocess.run([sys.executable, "-c", code], env=env, check=True),
+        startup,
+    )
+
+
+def main(argv=None):
+    load_env()
+
+    parser = argparse.ArgumentParser(description="Apple ES256 client_secret (JWT) 생성")
+    parser.add_argument("--batch", metavar="SPECS_JSON")
+    parser.add_argument("--benchmark", type=int, metavar="N")
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--renew-before", type=int, metavar="DAYS")
+    parser.add_argument("--show-cached", action="store_true")
+    args = parser.parse_args(argv)
+
+    # TTL 이상이면 갓 서명한 토큰도 갱신 대상이 되어 매번 재서명하게 된다
+    max_renew_before = CLIENT_SECRET_TTL // 86400
+    if args.renew_before is not None and not 0 <= args.renew_before < max_renew_before:
+        parser.error(
+            f"--renew-before 는 0 이상 {max_renew_before} 미만이어야 합니다 "
+            f"(TTL {max_renew_before}일)"
+        )
+
+    if args.check or args.renew_before is not None:
+        renew_before = args.renew_before
+        if renew_before is None:
+            renew_before = DEFAULT_RENEW_BEFORE_DAYS
+        status = ensure_client_secret(renew_before, check_only=args.check)
+        print(json.dumps(status))
+        if args.check and status["status"] != "valid":
+            sys.exit(1)
+        return
+    if args.show_cached:
+        show_cached_secret()
+        return
+
+    if args.benchmark:
+        run_benchmark(args.benchmark)
+        return
+    if args.batch:
+        run_batch(args.batch)
+        return
+
+    secret = generate_client_secret()
+    expiry_label = (datetime.utcnow() + timedelta(days=180)).strftime("%Y-%m-%d")
+    print("=" * 60)
+    print("Apple Sign In Client Secret (JWT)")
+    print("=" * 60)
+    print(
+        "\nSupabase Dashboard → Authentication → Providers → Apple → "
+        "Secret Key (for OAuth) 에 붙여넣으세요:\n"
+    )
+    print("-" * 60)
+    print(secret)
+    print("-" * 60)
+    print(f"\n만료일: {expiry_label} (6개월 후 재생성 필요)")
+    print("=" * 60)
 
 
 if __name__ == "__main__":
     try:
-        secret = generate_client_secret()
-        expiry_label = (datetime.utcnow() + timedelta(days=180)).strftime("%Y-%m-%d")
-        print("=" * 60)
-        print("Apple Sign In Client Secret (JWT)")
-        print("=" * 60)
-        print(
-            "\nSupabase Dashboard → Authentication → Providers → Apple → "
-            "Secret Key (for OAuth) 에 붙여넣으세요:\n"
-        )
-        print("-" * 60)
-        print(secret)
-        print("-" * 60)
-        print(f"\n만료일: {expiry_label} (6개월 후 재생성 필요)")
-        print("=" * 60)
+        run_main(main)
     except SystemExit:
         raise
     except Exception as e:
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+운세 아이콘 perceptual hash (dHash) 카탈로그
+
+split_fortune_icons.py 와 process_fortune_icons.py 가 같은
+assets/icons/fortune/ 에 출력하고 이름도 겹치므로 (daily, love, tarot ...)
+한 도구가 다른 도구의 결과를 조용히 덮어쓸 수 있다.
+생성된 아이콘마다 64bit dHash 를 카탈로그에 기록하고 다음을 잡아낸다.
+
+- duplicate: 이름이 다른데 거의 같은 그림
+- overwrite: 같은 이름을 다른 도구가 다시 씀
+- changed:   같은 도구가 같은 이름을 눈에 띄게 다른 그림으로 바꿈
+- unchanged: 바이트만 다르고 그림은 그대로인 재인코딩
+
+근접 검색은 해시를 16bit 밴드 4개로 나눈 인덱스로 한다. 해밍 거리 3 이하인
+두 해시는 비둘기집 원리로 최소 한 밴드가 정확히 같으므로, 전체 쌍 비교 없이
+같은 밴드 버킷에 있는 후보만 확인하면 된다.
+
+Usage:
+    python3 scripts/icon_phash.py [icon_dir] [--check]
+
+Options:
+    --check    카탈로그를 갱신하지 않고 duplicate 가 있으면 exit 1
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from typing import Dict, List, Optional, Set, Tuple
+from PIL import Image
+from instrumentation import run_log, run_main
+
+HASH_BITS = 64
+BANDS = 4
+BAND_BITS = HASH_BITS // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+# 이 거리 이하면 같은 그림으로 본다 (BANDS - 1 까지 인덱스로 누락 없이 검색됨)
+DUPLICATE_DISTANCE = BANDS - 1
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+DEFAULT_ICON_DIR = os.path.join(PROJECT_ROOT, "assets", "icons", "fortune")
+
+
+def dhash(img: Image.Image) -> int:
+    """
+    64bit difference hash
+
+    투명 영역은 흰 배경으로 합성한 뒤 9x8 회색조로 줄이고,
+    가로로 인접한 픽셀의 밝기 비교 결과를 비트로 쓴다.
+    """
+    if img.mode != 'RGBA':
+        img = img.convert('RGBA')
+    background = Image.new('RGBA', img.size, (255, 255, 255, 255))
+    gray = Image.alpha_composite(background, img).convert('L')
+    pixels = gray.resize((9, 8), Image.Resampling.LANCZOS).tobytes()
+
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+def catalog_path(icon_dir: str) -> str:
+    """아이콘 디렉토리 옆에 두는 카탈로그 파일 경로 (에셋 번들에 섞이지 않도록)"""
+    icon_dir = os.path.abspath(icon_dir)
+    name = os.path.basename(icon_dir)
+    return os.path.join(os.path.dirname(icon_dir), f"{name}_phash.json")
+
+
+class HashCatalog:
+    """이름 → (dHash, sha256, source) 카탈로그와 밴드 인덱스"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, dict] = {}
+        self._index: List[Dict[int, Set[str]]] = [{} for _ in range(BANDS)]
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for name, entry in json.load(f).items():
+                    self._put(name, entry)
+
+    @staticmethod
+    def _bands(value: int):
+        for band in range(BANDS):
+            yield band, (value >> (band * BAND_BITS)) & BAND_MASK
+
+    def _put(self, name: str, entry: dict):
+        self._drop(name)
+        self.entries[name] = entry
+        for band, key in self._bands(int(entry['dhash'], 16)):
+            self._index[band].setdefault(key, set()).add(name)
+
+    def _drop(self, name: str):
+        entry = self.entries.pop(name, None)
+        if entry is None:
+            return
+        for band, key in self._bands(int(entry['dhash'], 16)):
+            bucket = self._index[band].get(key)
+            if bucket:
+                bucket.discard(name)
+
+    def nearest(
+        self, value: int, max_distance: int = DUPLICATE_DISTANCE
+    ) -> List[Tuple[int, str]]:
+        """value 와 해밍 거리 max_distance 이하인 (거리, 이름) 목록, 가까운 순"""
+        candidates: Set[str] = set()
+        for band, key in self._bands(value):
+            candidates |= self._index[band].get(key, set())
+
+        matches = []
+        for name in candidates:
+            distance = hamming(value, int(self.entries[name]['dhash'], 16))
+            if distance <= max_distance:
+                matches.append((distance, name))
+        return sorted(matches)
+
+    def record(
+        self,
+        name: str,
+        img: Image.Image,
+        source: str,
+        data: Optional[bytes] = None,
+    ) -> List[str]:
+        """
+        아이콘을 카탈로그에 기록하고 경고 메시지 목록 반환
+
+        Args:
+            name: 출력 파일명 (예: daily.png)
+            img: 저장된 아이콘 이미지
+            source: 아이콘을 만든 도구 이름
+            data: 저장된 PNG 바이트 (재인코딩 판별용, 없으면 생략)
+        """
+        value = dhash(img)
+        digest = hashlib.sha256(data).hexdigest() if data is not None else None
+        warnings = []
+
+        previous = self.entries.get(name)
+        if previous:
+            distance = hamming(value, int(previous['dhash'], 16))
+            if previous['source'] != source:
+                warnings.append(
+                    f"overwrite: {name} ({previous['source']} → {source}, 거리 {distance})"
+                )
+            elif distance > DUPLICATE_DISTANCE:
+                warnings.append(f"changed: {name} (거리 {distance})")
+            elif digest and previous.get('sha256') and digest != previous['sha256']:
+                warnings.append(f"unchanged: {name} (재인코딩만 다름)")
+
+        for distance, other in self.nearest(value):
+            if other != name:
+                warnings.append(f"duplicate: {name} ≈ {other} (거리 {distance})")
+
+        self._put(name, {'dhash': f"{value:016x}", 'sha256': digest, 'source': source})
+        return warnings
+
+    def duplicates(self) -> List[Tuple[str, str, int]]:
+        """카탈로그 안의 근접 중복 쌍 (이름 순)"""
+        pairs = []
+        for name in sorted(self.entries):
+            value = int(self.entries[name]['dhash'], 16)
+            for distance, other in self.nearest(value):
+                if other > name:
+                    pairs.append((name, other, distance))
+        return pairs
+
+    def save(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write('\n')
+
+
+def scan(icon_dir: str, catalog: HashCatalog) -> List[str]:
+    """디렉토리의 PNG 를 카탈로그와 대조 (출처는 기존 기록 유지)"""
+    warnings = []
+    for filename in sorted(os.listdir(icon_dir)):
+        if not filename.endswith('.png'):
+            continue
+        path = os.path.join(icon_dir, filename)
+        with open(path, 'rb') as f:
+            data = f.read()
+        with Image.open(path) as img:
+            source = catalog.entries.get(filename, {}).get('source', 'unknown')
+            warnings += [
+                w for w in catalog.record(filename, img, source, data)
+                if not w.startswith('duplicate:')
+            ]
+    return warnings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="운세 아이콘 perceptual hash 카탈로그")
+    parser.add_argument('icon_dir', nargs='?', default=DEFAULT_ICON_DIR)
+    parser.add_argument('--check', action='store_true')
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.icon_dir):
+        print(f"Error: 디렉토리를 찾을 수 없습니다: {args.icon_dir}")
+        sys.exit(1)
+
+    catalog = HashCatalog(catalog_path(args.icon_dir))
+    with run_log.stage('scan'):
+        warnings = scan(args.icon_dir, catalog)
+        run_log.count('images', len(catalog.entries))
+    with run_log.stage('duplicates'):
+        duplicates = catalog.duplicates()
+
+    print(f"Icons: {len(catalog.entries)}")
+    for warning in warnings:
+        print(f"  ⚠️  {warning}")
+    for name, other, distance in duplicates:
+        print(f"  ✗ duplicate: {name} ≈ {other} (거리 {distance})")
+
+    if args.check:
+        sys.exit(1 if duplicates else 0)
+
+    catalog.save()
+    print(f"Saved: {catalog.path}")
+
+
+if __name__ == "__main__":
+    run_main(main)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+scripts/ 공용 계측 레이어
+
+스크립트는 모듈 전역 run_log 에 단계 타이머와 카운터를 기록한다.
+
+    from instrumentation import run_log
+
+    with run_log.stage('execute'):
+        ...
+        run_log.count('statements')
+
+단계 안에서 증가한 카운터는 그 단계에도 귀속되어 단계별 처리량
+(statements/sec, files/sec, images/sec ...) 이 계산된다.
+
+run_main(main) 으로 실행하면 공통 옵션이 추가된다 (스크립트 자체 옵션보다 먼저 제거됨).
+    --run-log PATH   실행 요약 JSON (단계별 시간, 카운터, 처리량, peak RSS) 저장
+    --profile        cProfile + tracemalloc 로 실행하고 --profile-dir (기본 ./profiles,
+                     FORTUNE_PROFILE_DIR) 에 <command>-<timestamp>.prof / .txt / .json 저장
+--run-log 는 환경변수 FORTUNE_RUN_LOG 로도 켤 수 있다.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+DEFAULT_PROFILE_DIR = "profiles"
+PROFILE_TOP = 40
+TRACEMALLOC_TOP = 20
+
+
+def peak_rss_mb() -> Optional[float]:
+    """프로세스 peak RSS (MB). resource 모듈이 없는 플랫폼이면 None."""
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 는 KB, macOS 는 byte 단위
+    if sys.platform == 'darwin':
+        return round(peak / (1024 * 1024), 1)
+    return round(peak / 1024, 1)
+
+
+class RunLog:
+    """단계 타이머와 카운터 수집기"""
+
+    def __init__(self, command: str = ''):
+        self.command = command
+        self.started_at = datetime.utcnow()
+        self._start = time.perf_counter()
+        self.stages: Dict[str, dict] = {}
+        self.counters: Dict[str, int] = {}
+        self._active: List[str] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        entry = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0, 'counters': {}})
+        self._active.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry['seconds'] += time.perf_counter() - start
+            entry['calls'] += 1
+            self._active.pop()
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+        for stage in set(self._active):
+            counters = self.stages[stage]['counters']
+            counters[name] = counters.get(name, 0) + n
+
+    def summary(self) -> dict:
+        wall = time.perf_counter() - self._start
+
+        def rates(counters, seconds):
+            if seconds <= 0:
+                return {}
+            return {f"{name}_per_sec": round(value / seconds, 2) for name, value in counters.items()}
+
+        return {
+            'command': self.command,
+            'argv': sys.argv,
+            'started_at': self.started_at.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'wall_seconds': round(wall, 4),
+            'peak_rss_mb': peak_rss_mb(),
+            'counters': dict(self.counters),
+            'rates': rates(self.counters, wall),
+            'stages': {
+                name: {
+                    'seconds': round(entry['seconds'], 4),
+                    'calls': entry['calls'],
+                    'counters': dict(entry['counters']),
+                    'rates': rates(entry['counters'], entry['seconds']),
+                }
+                for name, entry in self.stages.items()
+            },
+        }
+
+    def write(self, path: str, extra: Optional[dict] = None):
+        summary = self.summary()
+        if extra:
+            summary.update(extra)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+            f.write('\n')
+
+
+# 스크립트들이 공유하는 현재 실행의 수집기
+run_log = RunLog()
+
+
+def _profiled(fn, prefix: str):
+    """cProfile + tracemalloc 로 fn() 실행 후 보고서 저장, (결과, 추가 요약) 반환"""
+    import cProfile
+    import io
+    import pstats
+    import tracemalloc
+
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    try:
+        result = profiler.runcall(fn)
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        profiler.dump_stats(f"{prefix}.prof")
+        stream = io.StringIO()
+        stats = pstats.Stats(profiler, stream=stream).sort_stats('cumulative')
+        stats.print_stats(PROFILE_TOP)
+
+        with open(f"{prefix}.txt", 'w', encoding='utf-8') as f:
+            f.write(stream.getvalue())
+            f.write(f"\ntracemalloc peak: {traced_peak / (1024 * 1024):.1f} MB\n")
+            f.write(f"top {TRACEMALLOC_TOP} allocations by line:\n")
+            for stat in snapshot.statistics('lineno')[:TRACEMALLOC_TOP]:
+                f.write(f"  {stat}\n")
+
+    return result, {'tracemalloc_peak_mb': round(traced_peak / (1024 * 1024), 1)}
+
+
+def run_main(main, argv=None, command: Optional[str] = None):
+    """
+    --run-log / --profile 를 처리하며 main(argv) 실행
+
+    Args:
+        main: 스크립트의 main(argv) 함수
+        argv: 인자 목록 (기본값 sys.argv[1:])
+        command: 로그에 남길 커맨드 이름 (기본값 스크립트 파일명)
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    parser.add_argument('--run-log', default=os.environ.get('FORTUNE_RUN_LOG'))
+    parser.add_argument('--profile', action='store_true')
+    parser.add_argument(
+        '--profile-dir', default=os.environ.get('FORTUNE_PROFILE_DIR', DEFAULT_PROFILE_DIR)
+    )
+    options, rest = parser.parse_known_args(argv)
+
+    # main() 이 os.chdir 해도 (codemod --root) 실행 시점의 cwd 기준으로 저장
+    options.profile_dir = os.path.abspath(options.profile_dir)
+    if options.run_log:
+        options.run_log = os.path.abspath(options.run_log)
+
+    command = command or os.path.splitext(os.path.basename(sys.argv[0]))[0]
+    run_log.command = command
+
+    prefix = None
+    if options.profile:
+        os.makedirs(options.profile_dir, exist_ok=True)
+        stamp = datetime.utcnow().strftime('%Y%m%dT%H%M%S')
+        prefix = os.path.join(options.profile_dir, f"{command.replace(' ', '-')}-{stamp}")
+        options.run_log = options.run_log or f"{prefix}.json"
+
+    extra = {}
+    try:
+        if prefix:
+            result, extra = _profiled(lambda: main(rest), prefix)
+        else:
+            result = main(rest)
+    finally:
+        if prefix:
+            print(f"\n📈 Profile: {prefix}.txt", file=sys.stderr)
+        if options.run_log:
+            run_log.write(options.run_log, extra)
+            print(f"📝 Run log: {options.run_log}", file=sys.stderr)
+
+    return result
@@ -2,11 +2,17 @@
 """
 fontSize to TypographyUnified migration script
 Migrates all fontSize values to appropriate TypographyUnified styles
+
+--watch: 전체 마이그레이션 후 lib/ 를 감시하며 저장된 파일만 다시 처리
 """
 
+import argparse
 import os
 import re
 from pathlib import Path
+from instrumentation import run_log, run_main
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 
 # fontSize mapping
 FONTSIZE_MAPPING = {
@@ -28,25 +34,38 @@ FONTSIZE_MAPPING = {
 
 IMPORT_LINE = "import '../../../../core/theme/typography_unified.dart';"
 
-def should_skip_file(filepath):
+SKIP_PATTERNS = [
+    'fontScale',
+    'font_size_provider',
+    'typography_unified',
+    'toss_design_system',
+    'font_size_system'
+]
+
+# 컴파일된 규칙 (--watch 에서 파일마다 재사용)
+DYNAMIC_FONTSIZE_RE = re.compile(r'fontSize:\s*\d+\s*\*\s*\w+')
+IMPORT_RE = re.compile(r"import ['\"].*['\"];")
+CONST_TEXTSTYLE_RE = re.compile(r'const\s+TextStyle\(fontSize:\s*(\d+)\)')
+TEXTSTYLE_RE = re.compile(r'TextStyle\(\s*fontSize:\s*(\d+),([^)]+)\)')
+FONTSIZE_ARG_RE = re.compile(r'fontSize:\s*(\d+),')
+
+def should_skip_file(filepath, content=None):
     """Check if file should be skipped"""
-    skip_patterns = [
-        'fontScale',
-        'font_size_provider',
-        'typography_unified',
-        'toss_design_system',
-        'font_size_system'
-    ]
-
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-        for pattern in skip_patterns:
-            if pattern in content and 'fontSize:' in content:
-                # Check if it's dynamic fontSize
-                if re.search(r'fontSize:\s*\d+\s*\*\s*\w+', content):
-                    return True
+    if content is None:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+    for pattern in SKIP_PATTERNS:
+        if pattern in content and 'fontSize:' in content:
+            # Check if it's dynamic fontSize
+            if DYNAMIC_FONTSIZE_RE.search(content):
+                return True
     return False
 
+def is_target(path):
+    """마이그레이션 대상 Dart 파일인지 (generated / build 제외)"""
+    return path.endswith('.dart') and 'generated' not in path and 'build' not in path
+
 def add_import(content, filepath):
     """Add typography_unified import if not present"""
     if 'typography_unified' in content:
@@ -58,8 +77,7 @@ def add_import(content, filepath):
     import_line = f"import '{import_path}';"
 
     # Find last import line
-    import_pattern = r"import ['\"].*['\"];"
-    imports = list(re.finditer(import_pattern, content))
+    imports = list(IMPORT_RE.finditer(content))
 
     if imports:
         last_import = imports[-1]
@@ -73,7 +91,6 @@ def migrate_fontsize(content):
     changes = 0
 
     # Pattern 1: const TextStyle(fontSize: X)
-    pattern1 = r'const\s+TextStyle\(fontSize:\s*(\d+)\)'
     def replace1(match):
         nonlocal changes
         size = match.group(1)
@@ -81,10 +98,9 @@ def migrate_fontsize(content):
             changes += 1
             return FONTSIZE_MAPPING[size]
         return match.group(0)
-    content = re.sub(pattern1, replace1, content)
+    content = CONST_TEXTSTYLE_RE.sub(replace1, content)
 
     # Pattern 2: TextStyle(fontSize: X, ...)
-    pattern2 = r'TextStyle\(\s*fontSize:\s*(\d+),([^)]+)\)'
     def replace2(match):
         nonlocal changes
         size = match.group(1)
@@ -93,10 +109,9 @@ def migrate_fontsize(content):
             changes += 1
             return f'{FONTSIZE_MAPPING[size]}.copyWith({rest})'
         return match.group(0)
-    content = re.sub(pattern2, replace2, content)
+    content = TEXTSTYLE_RE.sub(replace2, content)
 
     # Pattern 3: fontSize: X (standalone in copyWith)
-    pattern3 = r'fontSize:\s*(\d+),'
     def replace3(match):
         nonlocal changes
         size = match.group(1)
@@ -104,7 +119,7 @@ def migrate_fontsize(content):
             changes += 1
             return ''  # Remove fontSize line when using copyWith
         return match.group(0)
-    content = re.sub(pattern3, replace3, content)
+    content = FONTSIZE_ARG_RE.sub(replace3, content)
 
     # Remove const from widgets using copyWith - simpler approach
     if 'TypographyUnified' in content and 'const Text(' in content:
@@ -116,9 +131,6 @@ def migrate_fontsize(content):
 
 def process_file(filepath):
     """Process a single file"""
-    if should_skip_file(filepath):
-        return 0
-
     with open(filepath, 'r', encoding='utf-8') as f:
         original = f.read()
 
@@ -126,6 +138,9 @@ def process_file(filepath):
     if 'fontSize:' not in original:
         return 0
 
+    if should_skip_file(filepath, original):
+        return 0
+
     content = add_import(original, filepath)
     content, changes = migrate_fontsize(content)
 
@@ -137,25 +152,58 @@ def process_file(filepath):
 
     return 0
 
-def main():
+def main(argv=None):
     """Main migration function"""
-    os.chdir('/Users/jacobmac/Desktop/Dev/fortune')
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--root', default=os.environ.get('FORTUNE_ROOT', REPO_ROOT),
+                        help='lib/ 가 있는 프로젝트 루트 (기본값: FORTUNE_ROOT 또는 저장소 루트)')
+    parser.add_argument('--watch', action='store_true',
+                        help='전체 처리 후 lib/ 변경 파일만 계속 처리')
+    args = parser.parse_args(argv)
+
+    os.chdir(args.root)
 
     total_changes = 0
     total_files = 0
 
     # Find all Dart files
-    for dart_file in Path('lib').rglob('*.dart'):
-        if 'generated' in str(dart_file) or 'build' in str(dart_file):
-            continue
-
-        changes = process_file(str(dart_file))
-        if changes > 0:
-            total_changes += changes
-            total_files += 1
+    with run_log.stage('migrate'):
+        for dart_file in Path('lib').rglob('*.dart'):
+            if not is_target(str(dart_file)):
+                continue
+
+            run_log.count('files')
+            changes = process_file(str(dart_file))
+            if changes > 0:
+                total_changes += changes
+                total_files += 1
+                run_log.count('changed_files')
+                run_log.count('changes', changes)
 
     print(f"\n📊 Total: {total_files} files, {total_changes} fontSize migrations")
+
+    if args.watch:
+        watch_lib()
     return total_files
 
+def watch_lib():
+    """lib/ 에서 저장된 Dart 파일만 다시 마이그레이션"""
+    from watch import watch_files
+
+    lib_dir = os.path.abspath('lib')
+
+    def handle(paths):
+        for path in paths:
+            relative = os.path.relpath(path)
+            if not is_target(relative):
+                continue
+            with run_log.stage('watch'):
+                run_log.count('files')
+                changes = process_file(relative)
+                if changes > 0:
+                    run_log.count('changes', changes)
+
+    watch_files(lib_dir, handle, suffixes=('.dart',))
+
 if __name__ == '__main__':
-    main()
+    run_main(main)
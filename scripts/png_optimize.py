@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+무손실 PNG 최적화 단계
+
+앱 번들 크기와 OTA 다운로드 크기를 줄이기 위해 아이콘 PNG 를 여러 방식으로
+인코딩해 보고 가장 작은 결과를 고른다. 모든 후보는 원본과 픽셀 단위로 같다.
+
+- 색 수가 256 이하면 팔레트(P) 모드로 변환 (왕복 비교로 무손실 확인)
+- 알파가 전부 불투명하면 RGB, 회색조면 L/LA 로 채널 축소
+- 메타데이터(iCCP, tEXt, EXIF 등) 제거
+- zlib 전략(default/filtered/huffman/rle/fixed) 을 병렬로 시도
+- zopfli 패키지가 있으면 zopflipng 재압축도 후보에 추가 (pip3 install zopfli)
+
+Usage:
+    python3 scripts/png_optimize.py <png 또는 디렉토리>... [--effort fast|max]
+
+Options:
+    --effort fast  zlib 기본/filtered 전략만 (인코딩 시간 우선)
+    --effort max   모든 zlib 전략 + zopfli (기본값, 용량 우선)
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional
+from PIL import Image, ImageChops
+from instrumentation import run_log, run_main
+
+try:
+    import zopfli.png as zopflipng  # type: ignore
+except ImportError:
+    zopflipng = None
+
+# zlib 압축 전략 (Pillow 의 compress_type 으로 전달)
+STRATEGIES = {
+    'default': zlib.Z_DEFAULT_STRATEGY,
+    'filtered': zlib.Z_FILTERED,
+    'huffman': zlib.Z_HUFFMAN_ONLY,
+    'rle': zlib.Z_RLE,
+    'fixed': zlib.Z_FIXED,
+}
+
+EFFORT_STRATEGIES = {
+    'fast': ('default', 'filtered'),
+    'max': tuple(STRATEGIES),
+}
+
+# 메타데이터 제거 시에도 픽셀 의미에 필요한 항목만 남긴다
+KEEP_INFO = ('transparency',)
+
+
+class PngResult(NamedTuple):
+    data: bytes
+    baseline_size: int
+    method: str
+    seconds: float
+
+
+def _same_pixels(a: Image.Image, b: Image.Image) -> bool:
+    diff = ImageChops.difference(a.convert('RGBA'), b.convert('RGBA'))
+    return diff.getbbox(alpha_only=False) is None
+
+
+def _strip_metadata(img: Image.Image) -> Image.Image:
+    img = img.copy()
+    img.info = {key: value for key, value in img.info.items() if key in KEEP_INFO}
+    return img
+
+
+def reduce_modes(img: Image.Image) -> Dict[str, Image.Image]:
+    """원본과 픽셀이 같은 더 작은 색상 모드 후보들 (이름 → 이미지)"""
+    rgba = img.convert('RGBA')
+    candidates = {'rgba': rgba}
+
+    opaque = rgba.getchannel('A').getextrema()[0] == 255
+    base = rgba
+    if opaque:
+        base = candidates['rgb'] = rgba.convert('RGB')
+
+    gray = base.convert('L' if opaque else 'LA')
+    if _same_pixels(gray, rgba):
+        candidates[gray.mode.lower()] = gray
+
+    colors = rgba.getcolors(256)
+    if colors:
+        palette = rgba.quantize(len(colors), method=Image.Quantize.FASTOCTREE)
+        if _same_pixels(palette, rgba):
+            candidates['palette'] = palette
+
+    return candidates
+
+
+def _encode(img: Image.Image, strategy: str) -> bytes:
+    buffer = io.BytesIO()
+    img.save(buffer, 'PNG', optimize=True, compress_type=STRATEGIES[strategy])
+    return buffer.getvalue()
+
+
+def optimize_png(
+    img: Image.Image,
+    effort: str = 'max',
+    workers: Optional[int] = None,
+) -> PngResult:
+    """
+    무손실 후보 인코딩을 병렬로 만들어 가장 작은 PNG 바이트 반환
+
+    Args:
+        img: 저장할 이미지
+        effort: 'fast' 또는 'max'
+        workers: 스레드 수 (기본값 CPU 수). zlib/zopfli 는 GIL 을 풀고 압축한다.
+    """
+    start = time.perf_counter()
+    modes = {
+        name: _strip_metadata(candidate)
+        for name, candidate in reduce_modes(img).items()
+    }
+    jobs = [
+        (f"{name}/{strategy}", candidate, strategy)
+        for name, candidate in modes.items()
+        for strategy in EFFORT_STRATEGIES[effort]
+    ]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        encoded = dict(zip(
+            (label for label, _, _ in jobs),
+            pool.map(lambda job: _encode(job[1], job[2]), jobs),
+        ))
+
+        if effort == 'max' and zopflipng is not None:
+            zopfli_inputs = {
+                name: min(
+                    (encoded[f"{name}/{strategy}"] for strategy in EFFORT_STRATEGIES[effort]),
+                    key=len,
+                )
+                for name in modes
+            }
+            names = list(zopfli_inputs)
+            for name, data in zip(names, pool.map(
+                lambda name: zopflipng.optimize(zopfli_inputs[name]), names
+            )):
+                encoded[f"{name}/zopfli"] = data
+
+    method, data = min(encoded.items(), key=lambda item: len(item[1]))
+    return PngResult(
+        data=data,
+        baseline_size=len(encoded['rgba/default']),
+        method=method,
+        seconds=time.perf_counter() - start,
+    )
+
+
+def save_png(img: Image.Image, path: str, effort: str = 'max') -> PngResult:
+    """optimize_png 결과를 path 에 기록"""
+    result = optimize_png(img, effort)
+    with open(path, 'wb') as f:
+        f.write(result.data)
+    return result
+
+
+def print_report(results: Dict[str, PngResult]):
+    """파일별 크기/시간 리포트와 합계 출력"""
+    if not results:
+        return
+
+    print(f"\n{'file':<28} {'baseline':>9} {'optimized':>9} {'saved':>6} {'ms':>7}  method")
+    for name, result in results.items():
+        size = len(result.data)
+        saved = 1 - size / result.baseline_size if result.baseline_size else 0
+        print(
+            f"{name:<28} {result.baseline_size:>9} {size:>9} {saved:>6.1%} "
+            f"{result.seconds * 1000:>7.1f}  {result.method}"
+        )
+
+    baseline = sum(r.baseline_size for r in results.values())
+    total = sum(len(r.data) for r in results.values())
+    seconds = sum(r.seconds for r in results.values())
+    print(
+        f"{'TOTAL':<28} {baseline:>9} {total:>9} "
+        f"{(1 - total / baseline if baseline else 0):>6.1%} {seconds * 1000:>7.1f}"
+    )
+
+
+def iter_png_paths(paths: List[str]):
+    for path in paths:
+        if os.path.isdir(path):
+            for filename in sorted(os.listdir(path)):
+                if filename.endswith('.png'):
+                    yield os.path.join(path, filename)
+        else:
+            yield path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="무손실 PNG 최적화")
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('--effort', choices=tuple(EFFORT_STRATEGIES), default='max')
+    args = parser.parse_args(argv)
+
+    if args.effort == 'max' and zopflipng is None:
+        print("zopfli 미설치: zlib 전략만 사용 (pip3 install zopfli)", file=sys.stderr)
+
+    results = {}
+    for path in iter_png_paths(args.paths):
+        if not os.path.exists(path):
+            print(f"Error: 파일을 찾을 수 없습니다: {path}")
+            sys.exit(1)
+
+        original_size = os.path.getsize(path)
+        with Image.open(path) as img:
+            img.load()
+        with run_log.stage('optimize'):
+            result = optimize_png(img, args.effort)
+            run_log.count('images')
+            run_log.count('bytes_saved', max(0, original_size - len(result.data)))
+
+        # 기존 파일보다 작을 때만 교체
+        if len(result.data) < original_size:
+            with open(path, 'wb') as f:
+                f.write(result.data)
+        results[os.path.basename(path)] = result
+
+    print_report(results)
+
+
+if __name__ == "__main__":
+    run_main(main)
@@ -3,15 +3,27 @@
 Ondo Icon Processor
 - Trim transparent background
 - Resize to 44x44
+- Lossless PNG optimization (png_optimize.py, --effort fast|max)
 - Save to assets/icons/fortune/
+- --watch: raw 디렉토리를 감시하며 추가/수정된 원본만 다시 처리
 """
 
 from PIL import Image
+import argparse
 import os
-
-# 경로 설정
-RAW_DIR = "/Users/jacobmac/Desktop/Dev/fortune/assets/icons/raw"
-OUTPUT_DIR = "/Users/jacobmac/Desktop/Dev/fortune/assets/icons/fortune"
+import unicodedata
+from icon_phash import HashCatalog, catalog_path
+from png_optimize import EFFORT_STRATEGIES, print_report, save_png
+from instrumentation import run_log, run_main
+
+# 경로 설정 (환경변수 또는 --raw-dir / --output-dir 로 변경 가능)
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+RAW_DIR = os.environ.get(
+    'FORTUNE_ICON_RAW_DIR', os.path.join(REPO_ROOT, 'assets', 'icons', 'raw')
+)
+OUTPUT_DIR = os.environ.get(
+    'FORTUNE_ICON_OUTPUT_DIR', os.path.join(REPO_ROOT, 'assets', 'icons', 'fortune')
+)
 
 # 이미지 매핑 (한글 파일명 → 영문 대상 파일명)
 MAPPING = {
@@ -71,13 +83,8 @@ def make_square(img):
 
     return new_img
 
-def process_image(input_path, output_path, size=44):
-    """이미지 처리: trim → square → resize"""
-    print(f"Processing: {os.path.basename(input_path)} → {os.path.basename(output_path)}")
-
-    # 이미지 열기
-    img = Image.open(input_path)
-
+def process_icon(img, size=44):
+    """메모리 상의 이미지 처리: trim → square → resize"""
     # RGBA로 변환
     if img.mode != 'RGBA':
         img = img.convert('RGBA')
@@ -89,40 +96,93 @@ def process_image(input_path, output_path, size=44):
     img = make_square(img)
 
     # 3. 44x44로 리사이징 (고품질)
-    img = img.resize((size, size), Image.Resampling.LANCZOS)
+    return img.resize((size, size), Image.Resampling.LANCZOS)
+
+def process_image(input_path, output_path, size=44, catalog=None, results=None, effort='max'):
+    """
+    이미지 처리: trim → square → resize → optimize
+
+    effort 는 PNG 최적화 강도 ('fast' 또는 'max', png_optimize.py 참고).
+
+    catalog 가 있으면 dHash 를 기록하고 경고 목록을 반환,
+    results 가 있으면 파일명 → PngResult 를 채운다.
+    """
+    print(f"Processing: {os.path.basename(input_path)} → {os.path.basename(output_path)}")
+
+    with run_log.stage('process'):
+        # 이미지 열기
+        img = Image.open(input_path)
+
+        # 1~3. trim → square → resize
+        img = process_icon(img, size)
 
     # 4. 저장
-    img.save(output_path, 'PNG', optimize=True)
+    name = os.path.basename(output_path)
+    with run_log.stage('optimize'):
+        result = save_png(img, output_path, effort)
+        run_log.count('images')
+        run_log.count('bytes_written', len(result.data))
     print(f"  ✓ Saved: {output_path}")
+    if results is not None:
+        results[name] = result
+
+    if catalog is None:
+        return []
+    with run_log.stage('hash'):
+        return catalog.record(name, img, 'process_fortune_icons', result.data)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ondo Icon Processor")
+    parser.add_argument('--raw-dir', default=RAW_DIR)
+    parser.add_argument('--output-dir', default=OUTPUT_DIR)
+    parser.add_argument('--watch', action='store_true')
+    parser.add_argument('--effort', choices=tuple(EFFORT_STRATEGIES), default=None,
+                        help='PNG 최적화 강도 (png_optimize.py 참고, 기본값 max, --watch 면 fast)')
+    args = parser.parse_args(argv)
+
+    # --watch 는 저장 직후 피드백이 목적이므로 zopfli 대신 zlib 전략만 쓴다
+    effort = args.effort or ('fast' if args.watch else 'max')
 
-def main():
     print("=" * 50)
     print("Ondo Icon Processor")
     print("=" * 50)
 
     # 출력 디렉토리 확인
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    os.makedirs(args.output_dir, exist_ok=True)
+    catalog = HashCatalog(catalog_path(args.output_dir))
 
     processed = 0
     errors = []
+    warnings = []
+    results = {}
 
     for src_name, dst_name in MAPPING.items():
-        src_path = os.path.join(RAW_DIR, src_name)
-        dst_path = os.path.join(OUTPUT_DIR, dst_name)
+        src_path = os.path.join(args.raw_dir, src_name)
+        dst_path = os.path.join(args.output_dir, dst_name)
 
         if not os.path.exists(src_path):
             errors.append(f"Not found: {src_name}")
             continue
 
         try:
-            process_image(src_path, dst_path)
+            warnings += process_image(
+                src_path, dst_path, catalog=catalog, results=results, effort=effort
+            )
             processed += 1
         except Exception as e:
             errors.append(f"Error processing {src_name}: {e}")
 
+    catalog.save()
+    print_report(results)
+
     print("\n" + "=" * 50)
     print(f"Processed: {processed}/{len(MAPPING)} images")
 
+    if warnings:
+        print("\nWarnings:")
+        for warning in warnings:
+            print(f"  ⚠️  {warning}")
+
     if errors:
         print("\nErrors:")
         for err in errors:
@@ -130,5 +190,31 @@ def main():
 
     print("=" * 50)
 
+    if args.watch:
+        watch_raw(args.raw_dir, args.output_dir, catalog, effort)
+
+def watch_raw(raw_dir, output_dir, catalog, effort='fast'):
+    """raw 디렉토리에서 저장된 원본만 처리 (카탈로그는 메모리에 유지)"""
+    from watch import watch_files
+
+    def handle(paths):
+        for path in paths:
+            # macOS 파일명은 NFD 로 들어올 수 있으므로 정규화 후 매핑
+            src_name = unicodedata.normalize('NFC', os.path.basename(path))
+            dst_name = MAPPING.get(src_name)
+            if dst_name is None:
+                print(f"  - 매핑 없음: {src_name}")
+                continue
+            try:
+                for warning in process_image(
+                    path, os.path.join(output_dir, dst_name), catalog=catalog, effort=effort
+                ):
+                    print(f"  ⚠️  {warning}")
+            except Exception as e:
+                print(f"  ✗ Error processing {src_name}: {e}")
+        catalog.save()
+
+    watch_files(raw_dir, handle, suffixes=('.png',))
+
 if __name__ == "__main__":
-    main()
+    run_main(main)
@@ -3,16 +3,33 @@
 한국 전통 수묵화 스타일 운세 아이콘 분할 스크립트
 5x5 그리드 이미지를 25개의 개별 PNG 파일로 분할
 
+셀 경계는 알파(투명 배경) 또는 배경 대비 명도의 투영 프로파일로 찾고,
+각 셀은 콘텐츠 영역에 맞게 trim 된다. 여백/거터가 균일하지 않아도 된다.
+
 Usage:
-    python3 scripts/split_fortune_icons.py <input_image_path>
+    python3 scripts/split_fortune_icons.py <input_image_path> [--grid N|auto] [--size PX] [--effort fast|max]
+
+Options:
+    --grid N     그리드 크기 (기본값 5). auto 이면 행/열 수도 자동 감지
+    --size PX    분할한 셀을 메모리에서 바로 process_fortune_icons 파이프라인
+                 (trim → square → resize)에 넘겨 PX x PX 아이콘으로 저장
+    --effort     PNG 최적화 강도 (png_optimize.py 참고, 기본값 max)
+    --output-dir 출력 디렉토리 (기본값 assets/icons/fortune)
 
 Example:
     python3 scripts/split_fortune_icons.py ~/Downloads/fortune_icons.png
+    python3 scripts/split_fortune_icons.py ~/Downloads/fortune_icons.png --size 44
 """
 
+import argparse
 import sys
 import os
-from PIL import Image
+from array import array
+from typing import Iterator, List, Optional, Tuple
+from PIL import Image, ImageChops
+from icon_phash import HashCatalog, catalog_path
+from png_optimize import EFFORT_STRATEGIES, print_report, save_png
+from instrumentation import run_log, run_main
 
 # 아이콘 이름 매핑 (5x5 그리드 순서)
 # Row 1 (1-5): 시간별, 전통사주, 토정비결, 살풀이, 오복
@@ -53,44 +70,176 @@ ICON_NAMES = [
     "family",          # 가족 운세
 ]
 
-def split_icons(input_path: str, output_dir: str, grid_size: int = 5):
+# 콘텐츠로 간주할 최소 알파/명도 차이 (스캔 노이즈 무시)
+NOISE_LEVEL = 8
+
+# grid 자동 감지 시 이보다 좁은 빈 틈은 같은 셀 안의 여백으로 취급 (변 길이 대비)
+MIN_GAP_RATIO = 0.01
+
+Span = Tuple[int, int]
+Box = Tuple[int, int, int, int]
+
+
+def content_mask(img: Image.Image) -> Image.Image:
+    """
+    콘텐츠 영역을 255, 배경을 0 으로 하는 L 모드 마스크 생성
+
+    투명 배경이면 알파 채널을, 불투명 이미지면 좌상단 픽셀을 배경색으로 보고
+    명도 차이를 사용한다.
+    """
+    mask = None
+    if img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info:
+        alpha = img.convert('RGBA').getchannel('A')
+        if alpha.getextrema()[0] < 255:
+            mask = alpha
+
+    if mask is None:
+        gray = img.convert('L')
+        background = Image.new('L', gray.size, gray.getpixel((0, 0)))
+        mask = ImageChops.difference(gray, background)
+
+    table = [0] * (NOISE_LEVEL + 1) + [255] * (255 - NOISE_LEVEL)
+    return mask.point(table)
+
+
+def projection(mask: Image.Image, axis: int) -> bytes:
+    """
+    마스크의 투영 프로파일 (axis=0: 열별, axis=1: 행별)
+
+    BOX 리샘플링으로 한 줄로 축소하므로 픽셀 단위 루프 없이 C 레벨에서 합산된다.
+    8비트로 평균을 내면 콘텐츠 픽셀이 아주 적은 줄(가는 붓 끝)이 0 으로 반올림되어
+    잘려 나가므로 float(F) 모드에서 합산한다. 1 은 해당 열/행에 콘텐츠가 있다는 뜻.
+    """
+    width, height = mask.size
+    size = (width, 1) if axis == 0 else (1, height)
+    means = array('f', mask.convert('F').resize(size, Image.Resampling.BOX).tobytes())
+    return bytes(1 if mean > 0 else 0 for mean in means)
+
+
+def find_spans(profile: bytes, count: Optional[int] = None) -> List[Span]:
+    """
+    프로파일에서 콘텐츠 구간 [start, end) 목록 찾기
+
+    Args:
+        profile: projection() 결과
+        count: 기대하는 셀 개수. 구간이 더 많으면 가장 좁은 틈부터 병합하고,
+            더 적으면 균등 분할로 되돌아간다. None 이면 좁은 틈만 병합.
+    """
+    length = len(profile)
+    spans = []
+    start = None
+    for i, value in enumerate(profile):
+        if value and start is None:
+            start = i
+        elif not value and start is not None:
+            spans.append((start, i))
+            start = None
+    if start is not None:
+        spans.append((start, length))
+
+    if count is None:
+        min_gap = max(1, int(length * MIN_GAP_RATIO))
+        merged: List[Span] = []
+        for span in spans:
+            if merged and span[0] - merged[-1][1] < min_gap:
+                merged[-1] = (merged[-1][0], span[1])
+            else:
+                merged.append(span)
+        return merged
+
+    while len(spans) > count:
+        i = min(range(len(spans) - 1), key=lambda k: spans[k + 1][0] - spans[k][1])
+        spans[i:i + 2] = [(spans[i][0], spans[i + 1][1])]
+
+    if len(spans) < count:
+        return [(i * length // count, (i + 1) * length // count) for i in range(count)]
+    return spans
+
+
+def with_mask_alpha(icon: Image.Image, mask: Image.Image) -> Image.Image:
+    """
+    셀의 콘텐츠 마스크를 알파에 합쳐 배경을 투명하게 만든 RGBA 이미지 반환
+
+    불투명 배경 시트에서도 process_icon 의 trim / 투명 패딩이 배경색과 섞이지 않게 한다.
+    알파가 있는 시트는 노이즈 이하 픽셀만 투명해진다.
+    """
+    icon = icon.convert('RGBA')
+    icon.putalpha(ImageChops.multiply(icon.getchannel('A'), mask))
+    return icon
+
+
+def find_grid(mask: Image.Image, grid_size: Optional[int] = 5) -> Tuple[List[Span], List[Span]]:
+    """마스크의 투영 프로파일에서 (행 구간 목록, 열 구간 목록) 찾기"""
+    rows = find_spans(projection(mask, 1), grid_size)
+    cols = find_spans(projection(mask, 0), grid_size)
+    return rows, cols
+
+
+def iter_cells(mask: Image.Image, rows: List[Span], cols: List[Span]) -> Iterator[Box]:
+    """
+    trim 된 셀 영역을 행 우선 순서로 하나씩 생성
+
+    시트와 마스크는 한 번에 메모리에 올리지만, 호출 측이 셀을 받는 대로 잘라
+    저장하면 잘라낸 아이콘은 한 번에 하나만 들고 있게 된다.
+    """
+    for top, bottom in rows:
+        for left, right in cols:
+            box = (left, top, right, bottom)
+            bbox = mask.crop(box).getbbox()
+            if bbox:
+                box = (left + bbox[0], top + bbox[1], left + bbox[2], top + bbox[3])
+            yield box
+
+
+def split_icons(
+    input_path: str,
+    output_dir: str,
+    grid_size: Optional[int] = 5,
+    size: Optional[int] = None,
+    effort: str = 'max',
+):
     """
     그리드 이미지를 개별 아이콘으로 분할
 
     Args:
         input_path: 입력 이미지 경로
         output_dir: 출력 디렉토리 경로
-        grid_size: 그리드 크기 (기본값 5x5)
+        grid_size: 그리드 크기 (기본값 5x5, None 이면 자동 감지)
+        size: 지정하면 process_fortune_icons 파이프라인으로 size x size 변환 후 저장
+        effort: PNG 최적화 강도 ('fast' 또는 'max')
     """
     # 이미지 로드
     img = Image.open(input_path)
     width, height = img.size
 
-    # 각 아이콘 크기 계산
-    icon_width = width // grid_size
-    icon_height = height // grid_size
+    process_icon = None
+    if size:
+        from process_fortune_icons import process_icon
 
     print(f"입력 이미지: {width}x{height}")
-    print(f"아이콘 크기: {icon_width}x{icon_height}")
-    print(f"그리드: {grid_size}x{grid_size} = {grid_size * grid_size}개")
+    print(f"그리드: {'자동 감지' if grid_size is None else f'{grid_size}x{grid_size}'}")
+    if size:
+        print(f"출력 크기: {size}x{size}")
     print()
 
     # 출력 디렉토리 생성
     os.makedirs(output_dir, exist_ok=True)
+    catalog = HashCatalog(catalog_path(output_dir))
+    warnings = []
+    results = {}
 
     # 각 아이콘 추출 및 저장
-    for idx in range(grid_size * grid_size):
-        row = idx // grid_size
-        col = idx % grid_size
-
-        # 크롭 영역 계산
-        left = col * icon_width
-        top = row * icon_height
-        right = left + icon_width
-        bottom = top + icon_height
+    count = 0
+    with run_log.stage('detect'):
+        mask = content_mask(img)
+        rows, cols = find_grid(mask, grid_size)
 
+    for idx, box in enumerate(iter_cells(mask, rows, cols)):
         # 아이콘 추출
-        icon = img.crop((left, top, right, bottom))
+        with run_log.stage('crop'):
+            icon = img.crop(box)
+            if process_icon:
+                icon = process_icon(with_mask_alpha(icon, mask.crop(box)), size)
 
         # 파일명 결정
         if idx < len(ICON_NAMES):
@@ -100,35 +249,64 @@ def split_icons(input_path: str, output_dir: str, grid_size: int = 5):
 
         # 저장
         output_path = os.path.join(output_dir, filename)
-        icon.save(output_path, "PNG")
+        with run_log.stage('optimize'):
+            result = save_png(icon, output_path, effort)
+            run_log.count('images')
+            run_log.count('bytes_written', len(result.data))
+        results[filename] = result
+        with run_log.stage('hash'):
+            warnings += catalog.record(filename, icon, "split_fortune_icons", result.data)
+        left, top, right, bottom = box
         print(f"  [{idx + 1:2d}] {filename} - ({left}, {top}) -> ({right}, {bottom})")
+        count += 1
+
+    catalog.save()
+    print_report(results)
+
+    if warnings:
+        print()
+        for warning in warnings:
+            print(f"  ⚠️  {warning}")
 
     print()
-    print(f"완료! {grid_size * grid_size}개 아이콘이 {output_dir}에 저장되었습니다.")
+    print(f"완료! {count}개 아이콘이 {output_dir}에 저장되었습니다.")
 
-def main():
-    if len(sys.argv) < 2:
-        print(__doc__)
-        print("Error: 입력 이미지 경로를 지정해주세요.")
-        sys.exit(1)
+def parse_grid(value: str) -> Optional[int]:
+    if value == 'auto':
+        return None
+    return int(value)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="한국 전통 수묵화 운세 아이콘 분할",
+        usage=__doc__,
+    )
+    parser.add_argument('input_path')
+    parser.add_argument('--grid', type=parse_grid, default=5)
+    parser.add_argument('--size', type=int, default=None)
+    parser.add_argument('--effort', choices=tuple(EFFORT_STRATEGIES), default='max')
+    parser.add_argument('--output-dir', default=None)
+    args = parser.parse_args(argv)
 
-    input_path = sys.argv[1]
+    input_path = args.input_path
 
     if not os.path.exists(input_path):
         print(f"Error: 파일을 찾을 수 없습니다: {input_path}")
         sys.exit(1)
 
-    # 프로젝트 루트 기준 출력 디렉토리
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
-    output_dir = os.path.join(project_root, "assets", "icons", "fortune")
+    # 기본값은 프로젝트 루트 기준 출력 디렉토리
+    output_dir = args.output_dir
+    if output_dir is None:
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        project_root = os.path.dirname(script_dir)
+        output_dir = os.path.join(project_root, "assets", "icons", "fortune")
 
     print("=" * 60)
     print("한국 전통 수묵화 운세 아이콘 분할")
     print("=" * 60)
     print()
 
-    split_icons(input_path, output_dir)
+    split_icons(input_path, output_dir, args.grid, args.size, args.effort)
 
 if __name__ == "__main__":
-    main()
+    run_main(main)
@@ -1,10 +1,21 @@
-import psycopg2
+import argparse
+import csv
+import json
 import os
+import queue
+import re
 import sys
+import threading
+import time
+from instrumentation import run_log, run_main
 
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 DEFAULT_SQL_FILE = os.path.join(REPO_ROOT, 'celebrity_saju_mega_final.sql')
 
+# happy eyeballs 시작 간격 (RFC 8305 권장값) 과 엔드포인트별 연결 제한 시간 (초)
+CONNECT_STAGGER = 0.25
+CONNECT_TIMEOUT = 10
+
 def get_required_database_url():
     for key in ('SUPABASE_DB_URL', 'DATABASE_URL'):
         value = os.environ.get(key, '').strip()
@@ -19,11 +30,14 @@ def get_alternative_urls():
         return []
     return [value.strip() for value in raw.split(',') if value.strip()]
 
-def try_connection(connection_string):
+def try_connection(connection_string, connect_timeout=CONNECT_TIMEOUT):
     """Try to connect to the database with given connection string"""
+    import psycopg2
+
+    run_log.count('connection_attempts')
     try:
         print(f"Trying connection: {connection_string}")
-        conn = psycopg2.connect(connection_string)
+        conn = psycopg2.connect(connection_string, connect_timeout=connect_timeout)
         cursor = conn.cursor()
         cursor.execute("SELECT version();")
         version = cursor.fetchone()
@@ -33,60 +47,432 @@ def try_connection(connection_string):
         print(f"❌ Connection failed: {e}")
         return None
 
-def execute_sql_file(conn, sql_file_path):
-    """Execute SQL file in chunks for better error handling"""
+
+def connect_first(urls, stagger=CONNECT_STAGGER, connect_timeout=CONNECT_TIMEOUT):
+    """
+    여러 엔드포인트에 happy eyeballs 방식으로 동시에 연결하고 가장 먼저 성공한 연결 반환
+
+    urls 순서대로 stagger 초 간격으로 시도를 시작하되, 진행 중인 시도가 모두 실패하면
+    다음 시도를 바로 시작한다. SELECT version() 까지 통과한 첫 연결을 쓰고, 늦게 성공한
+    연결은 닫는다. psycopg2 의 connect 는 중간에 끊을 수 없으므로 진행 중인 시도는
+    기다리지 않고 버리며 (connect_timeout 안에 끝나면서 스스로 닫힘), 첫 연결까지의
+    시간은 실패 시간의 합이 아니라 가장 빠른 엔드포인트의 지연이 된다.
+
+    Returns:
+        연결 또는 모두 실패하면 None
+
+    Raises:
+        ImportError: psycopg2 가 없을 때 (워커를 띄우기 전에 메인 스레드에서)
+    """
+    import psycopg2  # noqa: F401
+
+    results = queue.Queue()
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def attempt(url):
+        # 예외로 끝나더라도 반드시 결과를 넣어야 메인 스레드가 영원히 기다리지 않는다
+        conn = None
+        try:
+            conn = try_connection(url, connect_timeout)
+        finally:
+            with lock:
+                if conn is not None and done.is_set():
+                    conn.close()
+                else:
+                    results.put(conn)
+
+    pending = list(dict.fromkeys(urls))
+    running = 0
+    while pending or running:
+        if pending:
+            threading.Thread(target=attempt, args=(pending.pop(0),), daemon=True).start()
+            running += 1
+        try:
+            conn = results.get(timeout=stagger if pending else None)
+        except queue.Empty:
+            continue
+        running -= 1
+        if conn is None:
+            continue
+
+        with lock:
+            done.set()
+        # done 을 세우기 전에 도착한 다른 성공 연결 정리
+        while not results.empty():
+            other = results.get()
+            if other is not None:
+                other.close()
+        return conn
+
+    return None
+
+
+STAGE_TABLE = 'celebrities_stage'
+STAGE_CHUNK = 500
+
+INSERT_RE = re.compile(
+    r'^(?:\s*--[^\n]*\n)*\s*INSERT\s+INTO\s+(?:public\.)?celebrities\s*\(([^)]*)\)\s*'
+    r'(VALUES\b.*?)(?:\s+ON\s+CONFLICT\b(.*))?$',
+    re.IGNORECASE | re.DOTALL,
+)
+
+# YYYY-MM-DD 이면서 실제 존재하는 날짜 (잘못된 값에 예외를 내지 않도록 CASE 로 검사).
+# make_date 는 0년에 예외를 내므로 연도는 1000~9999 만 통과시킨다.
+VALID_BIRTH_DATE_SQL = r"""
+    CASE
+        WHEN birth_date::text !~ '^[1-9]\d{3}-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01])$' THEN false
+        ELSE substr(birth_date::text, 9, 2)::int <= extract(day from
+            make_date(substr(birth_date::text, 1, 4)::int, substr(birth_date::text, 6, 2)::int, 1)
+            + interval '1 month' - interval '1 day')
+    END
+"""
+
+
+def classify_statements(statements):
+    """
+    celebrities INSERT 와 그 외 문장을 분리 (번호는 파일 안 문장 순서, 1부터)
+
+    Returns:
+        (pre, inserts, post): 첫 INSERT 이전 문장, (번호, 컬럼 목록, VALUES 본문, ON CONFLICT 절),
+        나머지 문장
+    """
+    pre, inserts, post = [], [], []
+    for number, statement in enumerate(statements, 1):
+        match = INSERT_RE.match(statement)
+        if match:
+            columns = [column.strip().strip('"') for column in match.group(1).split(',')]
+            conflict = ' '.join((match.group(3) or '').split())
+            inserts.append((number, columns, match.group(2), conflict))
+        elif inserts:
+            post.append((number, statement))
+        else:
+            pre.append((number, statement))
+    return pre, inserts, post
+
+
+def execute_guarded(cursor, statement):
+    """SAVEPOINT 안에서 실행. 실패해도 트랜잭션의 이전 작업은 유지하고 예외를 반환."""
+    cursor.execute("SAVEPOINT upload_stmt")
     try:
-        with open(sql_file_path, 'r', encoding='utf-8') as file:
-            sql_content = file.read()
+        cursor.execute(statement)
+    except Exception as e:
+        cursor.execute("ROLLBACK TO SAVEPOINT upload_stmt")
+        return e
+    cursor.execute("RELEASE SAVEPOINT upload_stmt")
+    return None
+
+
+def execute_statements(cursor, statements, failures):
+    for number, statement in statements:
+        error = execute_guarded(cursor, statement + ';')
+        run_log.count('statements')
+        if error:
+            failures.append((number, str(error).strip().splitlines()[0]))
+
+
+def create_stage_table(cursor):
+    """
+    제약 없는 임시 스테이징 테이블 (잘못된 행도 받아서 한 번에 검증하기 위해)
+
+    Returns:
+        public.celebrities 의 NOT NULL 컬럼 목록
+    """
+    cursor.execute(
+        f"CREATE TEMP TABLE {STAGE_TABLE} "
+        "(LIKE public.celebrities INCLUDING DEFAULTS) ON COMMIT DROP;"
+    )
+    cursor.execute(
+        "SELECT column_name FROM information_schema.columns "
+        "WHERE table_schema = 'public' AND table_name = 'celebrities' AND is_nullable = 'NO';"
+    )
+    required = [column for (column,) in cursor.fetchall()]
+    for column in required:
+        cursor.execute(f'ALTER TABLE {STAGE_TABLE} ALTER COLUMN "{column}" DROP NOT NULL;')
+    # _stmt: 행을 만든 SQL 파일 문장 번호 (reject 파일에서 원본을 찾기 위해)
+    # _group: 그 문장의 (컬럼 목록, ON CONFLICT 절) 묶음 번호 (묶음별로 병합하기 위해)
+    cursor.execute(
+        f"ALTER TABLE {STAGE_TABLE} ADD COLUMN _row bigserial, "
+        "ADD COLUMN _stmt integer DEFAULT current_setting('upload.stmt', true)::integer, "
+        "ADD COLUMN _group integer DEFAULT current_setting('upload.merge_group', true)::integer, "
+        "ADD COLUMN _reject text;"
+    )
+    return required
+
+
+def table_checks(cursor):
+    """
+    public.celebrities 의 CHECK 제약을 (거부 사유, 조건식) 목록으로 반환
+
+    허용 category 등은 마이그레이션마다 달라지므로 목록을 복사하지 않고 실제 테이블의
+    제약을 그대로 스테이징 행에 적용한다. 한 컬럼 제약이면 사유는 invalid_<컬럼>.
+    """
+    cursor.execute(
+        """
+        SELECT con.conname, pg_get_constraintdef(con.oid), array_agg(att.attname::text)
+        FROM pg_constraint con
+        JOIN pg_attribute att ON att.attrelid = con.conrelid AND att.attnum = ANY(con.conkey)
+        WHERE con.conrelid = 'public.celebrities'::regclass AND con.contype = 'c'
+        GROUP BY con.oid, con.conname
+        ORDER BY con.conname;
+        """
+    )
+    checks = []
+    for name, definition, columns in cursor.fetchall():
+        condition = re.sub(r'\s+NOT VALID$', '', definition)
+        condition = re.sub(r'^CHECK\s*', '', condition)
+        reason = f"invalid_{columns[0]}" if len(columns) == 1 else f"check_{name}"
+        checks.append((re.sub(r'\W', '_', reason), condition))
+    return checks
+
+
+def group_inserts(inserts):
+    """INSERT 를 (컬럼 목록, ON CONFLICT 절) 로 묶어 {묶음: 번호} 반환 (처음 나온 순서)"""
+    groups = {}
+    for _, columns, _, conflict in inserts:
+        groups.setdefault((tuple(columns), conflict), len(groups))
+    return groups
+
+
+def stage_inserts(cursor, inserts, groups, failures):
+    """INSERT 를 스테이징 테이블로 돌려 STAGE_CHUNK 개씩 한 번에 전송 (실패한 묶음만 문장 단위 재시도)"""
+    rewritten = [
+        (number, f"SET LOCAL upload.stmt = {number};\n"
+                 f"SET LOCAL upload.merge_group = {groups[(tuple(columns), conflict)]};\n"
+                 f"INSERT INTO {STAGE_TABLE} ({', '.join(columns)}) {values}")
+        for number, columns, values, conflict in inserts
+    ]
+    for start in range(0, len(rewritten), STAGE_CHUNK):
+        chunk = rewritten[start:start + STAGE_CHUNK]
+        error = execute_guarded(cursor, ';\n'.join(statement for _, statement in chunk) + ';')
+        if error:
+            execute_statements(cursor, chunk, failures)
+        else:
+            run_log.count('statements', len(chunk))
+
+
+def validate_stage(cursor, required, plain_groups):
+    """
+    형식/제약/중복 검사를 set 단위 UPDATE 로 수행하고 사유별 건수 반환
+
+    Args:
+        required: NOT NULL 컬럼 목록 (create_stage_table() 결과)
+        plain_groups: ON CONFLICT 없는 INSERT 묶음 번호 (이미 있는 id 는 거부)
+    """
+    cursor.execute(f"ANALYZE {STAGE_TABLE};")
+
+    # CHECK 는 NULL 을 통과시키므로 NOT NULL 을 먼저 본다
+    rules = [
+        ("id IS NULL OR btrim(id::text) = ''", 'missing_id'),
+        ("name IS NULL OR btrim(name) = ''", 'missing_name'),
+        (f"birth_date IS NULL OR NOT ({VALID_BIRTH_DATE_SQL})", 'invalid_birth_date'),
+    ]
+    rules += [
+        (f'"{column}" IS NULL', f"missing_{column}")
+        for column in required if column not in ('id', 'name', 'birth_date')
+    ]
+    rules += [(f"NOT {condition}", reason) for reason, condition in table_checks(cursor)]
+    whens = '\n'.join(f"WHEN {condition} THEN '{reason}'" for condition, reason in rules)
+    cursor.execute(f"UPDATE {STAGE_TABLE} SET _reject = CASE {whens} END;")
+
+    # 같은 id 가 여러 번 나오면 마지막 행만 남긴다 (순차 ON CONFLICT 와 같은 결과)
+    cursor.execute(
+        f"""
+        UPDATE {STAGE_TABLE} s SET _reject = 'duplicate_id'
+        FROM (
+            SELECT _row, row_number() OVER (PARTITION BY id ORDER BY _row DESC) AS rn
+            FROM {STAGE_TABLE} WHERE _reject IS NULL
+        ) d
+        WHERE s._row = d._row AND d.rn > 1;
+        """
+    )
+    if plain_groups:
+        cursor.execute(
+            f"""
+            UPDATE {STAGE_TABLE} s SET _reject = 'existing_id'
+            WHERE _reject IS NULL AND _group = ANY(%s)
+              AND EXISTS (SELECT 1 FROM public.celebrities c WHERE c.id = s.id);
+            """,
+            (list(plain_groups),),
+        )
+
+    # 같은 이름 + 생년월일이 다른 id 로 들어오면 같은 인물의 중복으로 본다
+    cursor.execute(
+        f"""
+        UPDATE {STAGE_TABLE} s SET _reject = 'duplicate_name'
+        FROM (
+            SELECT _row, id, first_value(id) OVER (
+                PARTITION BY name, birth_date ORDER BY _row
+            ) AS first_id
+            FROM {STAGE_TABLE} WHERE _reject IS NULL
+        ) d
+        WHERE s._row = d._row AND d.id <> d.first_id;
+        """
+    )
+    cursor.execute(
+        f"""
+        UPDATE {STAGE_TABLE} s SET _reject = 'duplicate_name'
+        WHERE _reject IS NULL AND EXISTS (
+            SELECT 1 FROM public.celebrities c
+            WHERE c.name = s.name AND c.birth_date = s.birth_date AND c.id <> s.id
+        );
+        """
+    )
+
+    cursor.execute(
+        f"SELECT _reject, COUNT(*) FROM {STAGE_TABLE} "
+        "WHERE _reject IS NOT NULL GROUP BY _reject ORDER BY 2 DESC;"
+    )
+    return dict(cursor.fetchall())
+
+
+def merge_stage(cursor, groups):
+    """
+    검증을 통과한 행을 public.celebrities 에 묶음마다 한 문장으로 병합
+
+    각 묶음은 원래 INSERT 의 컬럼 목록과 ON CONFLICT 절을 그대로 쓰므로, DO NOTHING /
+    일반 INSERT 가 갱신으로 바뀌거나 문장이 넘기지 않은 컬럼이 덮어써지지 않는다.
+    유효한 행은 id 가 유일하므로 (duplicate_id) 묶음끼리 같은 행을 건드리지 않는다.
+
+    Returns:
+        (inserted_ids, updated_ids)
+    """
+    from psycopg2 import sql
+
+    inserted, updated = [], []
+    for (columns, conflict), group in groups.items():
+        identifiers = sql.SQL(', ').join(sql.Identifier(column) for column in columns)
+        cursor.execute(
+            sql.SQL(
+                """
+                INSERT INTO public.celebrities ({columns})
+                SELECT {columns} FROM {stage}
+                WHERE _reject IS NULL AND _group = %s ORDER BY _row
+                {conflict}
+                RETURNING id, (xmax = 0) AS inserted;
+                """
+            ).format(
+                columns=identifiers,
+                stage=sql.Identifier(STAGE_TABLE),
+                # 원문 절은 SQL 조각 그대로 쓰므로 파라미터 자리표시자로 읽히지 않게 % 를 이스케이프
+                conflict=sql.SQL(f"ON CONFLICT {conflict.replace('%', '%%')}" if conflict else ''),
+            ),
+            (group,),
+        )
+        for celeb_id, is_insert in cursor.fetchall():
+            (inserted if is_insert else updated).append(celeb_id)
+    return inserted, updated
+
+
+def write_rejects(path, cursor, failures):
+    """거부된 행과 실패한 문장을 문장 번호 순으로 CSV 한 파일에 기록, 기록한 건수 반환"""
+    cursor.execute(
+        f"SELECT _stmt, id, name, birth_date::text, category, gender, _reject "
+        f"FROM {STAGE_TABLE} WHERE _reject IS NOT NULL ORDER BY _row;"
+    )
+    rows = cursor.fetchall()
+    rows += [(number, '', '', '', '', '', f"sql_error: {error}") for number, error in failures]
+    if not rows:
+        if os.path.exists(path):
+            os.remove(path)
+        return 0
+
+    rows.sort(key=lambda row: row[0])
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['statement', 'id', 'name', 'birth_date', 'category', 'gender', 'reason'])
+        writer.writerows(rows)
+    return len(rows)
+
+
+def execute_sql_file(conn, sql_file_path, rejects_path=None, report_path=None):
+    """
+    SQL 파일을 스테이징 → 일괄 검증 → set 단위 병합으로 적재
+
+    celebrities INSERT 는 임시 테이블에 모은 뒤 검증을 통과한 행만 (컬럼 목록,
+    ON CONFLICT 절) 묶음마다 한 문장으로 병합하고, 거부된 행과 실패한 문장은
+    사유와 함께 rejects_path (CSV) 에 남긴다. 그 외 문장은 원래 위치(첫 INSERT 이전 / 이후)에서 실행한다. 문장마다 SAVEPOINT 를
+    두므로 실패가 같은 트랜잭션의 앞선 작업을 되돌리지 않는다.
+    """
+    try:
+        with run_log.stage('read'):
+            with open(sql_file_path, 'r', encoding='utf-8') as file:
+                sql_content = file.read()
+            run_log.count('sql_chars', len(sql_content))
         
         cursor = conn.cursor()
         
-        # Check current count before
-        cursor.execute("SELECT COUNT(*) FROM public.celebrities;")
-        initial_count = cursor.fetchone()[0]
-        print(f"Initial celebrity count: {initial_count}")
-        
         print("Executing SQL file...")
         print(f"SQL file size: {len(sql_content)} characters")
         
         # Split SQL into individual statements
-        statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
-        
-        successful_statements = 0
-        failed_statements = 0
-        
-        for i, statement in enumerate(statements):
-            if not statement:
-                continue
-                
-            try:
-                cursor.execute(statement + ';')
-                successful_statements += 1
-                
-                if i % 50 == 0:  # Progress update every 50 statements
-                    print(f"Progress: {i}/{len(statements)} statements processed")
-                    
-            except Exception as e:
-                failed_statements += 1
-                print(f"⚠️  Statement {i} failed: {e}")
-                print(f"Statement: {statement[:200]}...")
-                
-                # Continue with other statements
-                conn.rollback()
+        with run_log.stage('split'):
+            statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
+            pre, inserts, post = classify_statements(statements)
+        print(f"Statements: {len(statements)} ({len(inserts)} celebrity inserts)")
         
-        # Commit all successful transactions
-        conn.commit()
+        failures = []
+        started = time.perf_counter()
+        
+        with run_log.stage('execute'):
+            execute_statements(cursor, pre, failures)
+        
+        groups = group_inserts(inserts)
+        plain_groups = [group for (_, conflict), group in groups.items() if not conflict]
+        
+        with run_log.stage('stage'):
+            required = create_stage_table(cursor)
+            stage_inserts(cursor, inserts, groups, failures)
+            cursor.execute(f"SELECT COUNT(*) FROM {STAGE_TABLE};")
+            staged = cursor.fetchone()[0]
+            run_log.count('staged_rows', staged)
+        
+        with run_log.stage('validate'):
+            reasons = validate_stage(cursor, required, plain_groups)
+            rejected = sum(reasons.values())
+            run_log.count('rejected', rejected)
+        
+        with run_log.stage('merge'):
+            inserted, updated = merge_stage(cursor, groups)
+            run_log.count('inserted', len(inserted))
+            run_log.count('updated', len(updated))
         
-        # Check final count
-        cursor.execute("SELECT COUNT(*) FROM public.celebrities;")
-        final_count = cursor.fetchone()[0]
+        with run_log.stage('execute'):
+            execute_statements(cursor, post, failures)
+        
+        rejects_path = rejects_path or os.path.splitext(sql_file_path)[0] + '.rejects.csv'
+        written = write_rejects(rejects_path, cursor, failures)
+        
+        if report_path:
+            cursor.execute(
+                f"SELECT id FROM {STAGE_TABLE} WHERE _reject IS NOT NULL ORDER BY _row;"
+            )
+            report = {
+                'inserted': inserted,
+                'updated': updated,
+                'rejected': [celeb_id for (celeb_id,) in cursor.fetchall()],
+                'reject_reasons': reasons,
+                'failed_statements': [number for number, _ in failures],
+            }
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        
+        # Commit all successful transactions
+        with run_log.stage('commit'):
+            conn.commit()
         
         print(f"\n📊 Upload Summary:")
-        print(f"Initial count: {initial_count}")
-        print(f"Final count: {final_count}")
-        print(f"Added: {final_count - initial_count}")
-        print(f"Successful statements: {successful_statements}")
-        print(f"Failed statements: {failed_statements}")
+        print(f"Staged rows: {staged}")
+        print(f"Inserted: {len(inserted)}")
+        print(f"Updated: {len(updated)}")
+        print(f"Unchanged: {staged - rejected - len(inserted) - len(updated)}")
+        print(f"Rejected: {rejected}")
+        for reason, count in reasons.items():
+            print(f"  - {reason}: {count}")
+        print(f"Failed statements: {len(failures)}")
+        print(f"Execute time: {time.perf_counter() - started:.1f}s")
+        if written:
+            print(f"Rejects: {rejects_path}")
         
         return True
         
@@ -95,29 +481,45 @@ def execute_sql_file(conn, sql_file_path):
         conn.rollback()
         return False
 
-def main():
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Upload celebrity saju SQL to Supabase")
+    parser.add_argument('--sql', default=os.environ.get('CELEBRITY_SQL_PATH', DEFAULT_SQL_FILE),
+                        help='SQL file (default: CELEBRITY_SQL_PATH or celebrity_saju_mega_final.sql)')
+    parser.add_argument('--rejects', default=None,
+                        help='reject CSV path (default: <sql file>.rejects.csv)')
+    parser.add_argument('--report', default=None,
+                        help='write inserted/updated/rejected keys as JSON')
+    parser.add_argument('--stagger', type=float, default=CONNECT_STAGGER,
+                        help=f'seconds between connection attempts (default: {CONNECT_STAGGER})')
+    parser.add_argument('--connect-timeout', type=int, default=CONNECT_TIMEOUT,
+                        help=f'per-endpoint connect timeout in seconds (default: {CONNECT_TIMEOUT})')
+    args = parser.parse_args(argv)
+
     database_url = get_required_database_url()
     if not database_url:
         print('❌ Missing database connection string.')
         print('Set SUPABASE_DB_URL or DATABASE_URL before running this script.')
         sys.exit(1)
 
-    sql_file_path = os.environ.get('CELEBRITY_SQL_PATH', DEFAULT_SQL_FILE)
+    sql_file_path = args.sql
     
     if not os.path.exists(sql_file_path):
         print(f"❌ SQL file not found: {sql_file_path}")
         sys.exit(1)
     
-    # Try main connection first
-    conn = try_connection(database_url)
-    
-    # If main connection fails, try alternatives
-    if not conn:
-        print("\nTrying alternative connection strings...")
-        for alt_url in get_alternative_urls():
-            conn = try_connection(alt_url)
-            if conn:
-                break
+    with run_log.stage('connect'):
+        # Race the main connection and alternatives, preferring them in that order
+        try:
+            conn = connect_first(
+                [database_url, *get_alternative_urls()],
+                stagger=args.stagger,
+                connect_timeout=args.connect_timeout,
+            )
+        except ImportError as e:
+            print(f"❌ psycopg2 unavailable: {e}")
+            print("Install it with: pip3 install psycopg2-binary")
+            sys.exit(1)
     
     if not conn:
         print("❌ All connection attempts failed.")
@@ -130,7 +532,7 @@ def main():
     
     try:
         # Execute the SQL file
-        success = execute_sql_file(conn, sql_file_path)
+        success = execute_sql_file(conn, sql_file_path, args.rejects, args.report)
         
         if success:
             print("✅ Celebrity data upload completed successfully!")
@@ -143,4 +545,4 @@ def main():
         print("Database connection closed.")
 
 if __name__ == "__main__":
-    main()
+    run_main(main)
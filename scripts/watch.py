@@ -0,0 +1,166 @@
+"""
+--watch 모드 공용 파일 감시기
+
+watchdog 이 설치돼 있으면 OS 이벤트(inotify / FSEvents)를, 없으면 mtime 폴링을
+쓴다 (pip3 install watchdog 권장). 짧은 시간에 몰린 이벤트는 debounce 로 묶어
+변경된 파일 목록을 한 번에 콜백에 넘긴다. 콜백을 부르는 프로세스가 계속 살아
+있으므로 컴파일된 정규식, 카탈로그 같은 상태는 매 배치마다 다시 만들지 않는다.
+
+    from watch import watch_files
+
+    watch_files('lib', handle_batch, suffixes=('.dart',))
+"""
+
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+DEBOUNCE_SECONDS = 0.15
+POLL_INTERVAL = 0.5
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class _Pending:
+    """debounce 중인 변경 경로 모음 (감시 스레드 → 메인 스레드)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._paths: Set[str] = set()
+        self._last_event = 0.0
+
+    def add(self, path: str):
+        with self._lock:
+            self._paths.add(path)
+            self._last_event = time.monotonic()
+
+    def take_if_quiet(self, debounce: float) -> Set[str]:
+        with self._lock:
+            if not self._paths or time.monotonic() - self._last_event < debounce:
+                return set()
+            paths, self._paths = self._paths, set()
+            return paths
+
+
+def _start_watchdog(root: str, pending: _Pending, accept: Callable[[str], bool]):
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return None
+
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if event.is_directory:
+                return
+            path = getattr(event, 'dest_path', '') or event.src_path
+            if accept(path):
+                pending.add(path)
+
+    observer = Observer()
+    observer.schedule(Handler(), root, recursive=True)
+    observer.start()
+
+    def stop():
+        observer.stop()
+        observer.join()
+
+    return stop
+
+
+def _scan(root: str, accept: Callable[[str], bool]) -> Dict[str, Optional[int]]:
+    snapshot = {}
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            if accept(path):
+                snapshot[path] = _mtime(path)
+    return snapshot
+
+
+def _start_polling(root: str, pending: _Pending, accept: Callable[[str], bool], interval: float):
+    stopped = threading.Event()
+
+    def loop():
+        snapshot = _scan(root, accept)
+        while not stopped.wait(interval):
+            current = _scan(root, accept)
+            for path, mtime in current.items():
+                if snapshot.get(path) != mtime:
+                    pending.add(path)
+            snapshot = current
+
+    thread = threading.Thread(target=loop, daemon=True)
+    thread.start()
+
+    def stop():
+        stopped.set()
+        thread.join()
+
+    return stop
+
+
+def watch_files(
+    root: str,
+    on_change: Callable[[List[str]], None],
+    suffixes: Tuple[str, ...],
+    debounce: float = DEBOUNCE_SECONDS,
+    poll_interval: float = POLL_INTERVAL,
+    ignore: Iterable[str] = (),
+):
+    """
+    root 아래 suffixes 파일이 바뀔 때마다 on_change(정렬된 경로 목록) 호출 (Ctrl+C 로 종료)
+
+    Args:
+        root: 감시할 디렉토리
+        on_change: 변경 배치 콜백
+        suffixes: 감시할 파일 확장자
+        debounce: 마지막 이벤트 후 이 시간(초) 동안 조용하면 배치 처리
+        poll_interval: watchdog 이 없을 때 폴링 주기(초)
+        ignore: 경로에 포함되면 무시할 문자열 (예: 'generated')
+    """
+    ignore = tuple(ignore)
+
+    def accept(path: str) -> bool:
+        return path.endswith(suffixes) and not any(part in path for part in ignore)
+
+    pending = _Pending()
+    stop = _start_watchdog(root, pending, accept)
+    backend = 'watchdog'
+    if stop is None:
+        stop = _start_polling(root, pending, accept, poll_interval)
+        backend = f'polling {poll_interval}s (pip3 install watchdog 로 즉시 감지)'
+
+    # 콜백 직전 mtime. 콜백이 같은 파일을 다시 쓰면 한 번 더 들어오지만
+    # 변경이 없으면 쓰지 않으므로 수렴한다 (사용자 저장을 놓치지 않는 쪽을 택함).
+    seen: Dict[str, Optional[int]] = {}
+
+    print(f"👀 Watching {root} ({backend}) — Ctrl+C to stop", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(debounce / 3)
+            paths = pending.take_if_quiet(debounce)
+            changed = []
+            for path in sorted(paths):
+                mtime = _mtime(path)
+                if mtime is not None and mtime != seen.get(path):
+                    seen[path] = mtime
+                    changed.append(path)
+            if not changed:
+                continue
+
+            start = time.perf_counter()
+            on_change(changed)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"⚡ {len(changed)} file(s) in {elapsed:.1f} ms", file=sys.stderr)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop()